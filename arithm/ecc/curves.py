@@ -1,20 +1,141 @@
 import hashlib
-from ..field import Field
-from .ecc import Point
+from ..field import Field, batch_invert
+from .ecc import Point, batch_to_affine, batch_add_affine
 from .edwards import EdwardsPoint
+from . import edwards
+from .montgomery import MontgomeryPoint
+from .mults import mont_ml
+
+
+def _field_name(name, p, field):
+    """Name of a curve rebuilt over `field`, distinct from the original one so
+    that their tuning results are kept apart"""
+    base = name if name is not None else f"{p:x}"
+    if hasattr(field, "word"):
+        # LimbField: its configuration determines the costs
+        return f"{base}/limb{field.word}-{field.mul}-{field.reduction}"
+    return f"{base}/{type(field).__name__}"
 
 
 class WeierstrassCurve:
-    def __init__(self, p, a, b, order, gx, gy):
-        F = Field(p)
+    def __init__(self, p, a, b, order, gx, gy, name=None, field=None):
+        F = Field(p) if field is None else field
+        self.name = name
+        self.F = F
+        self.p = p
         self.a = F(a)
         self.b = F(b)
         self.G = Point(self, F(gx), F(gy))
         self.order = order
         self.zero = Point(self, F(0), F(1), F(0))
+        # byte length of an encoded field element (SEC1 2.3.5)
+        self.size = (p.bit_length() + 7) // 8
+        # exponent for square roots when p = 3 mod 4, cached for decompression
+        self.sqrt_exp = (p + 1) // 4 if p % 4 == 3 else None
+
+    def with_field(self, field):
+        """The same curve over another implementation of its base field (e.g. a `LimbField`)"""
+        G = self.G.to_affine()
+        name = _field_name(self.name, self.p, field)
+        return WeierstrassCurve(
+            self.p, self.a.val, self.b.val, self.order, G.x.val, G.y.val, name, field
+        )
 
     def is_on_curve(self, p):
-        return p.y * p.y == p.x**3 + p.x * self.a + self.b
+        """Check Y^2 = X^3 + a.X.Z^4 + b.Z^6 (Jacobian coordinates)"""
+        if p.is_at_infinity():
+            return True
+        zz = p.z * p.z
+        z4 = zz * zz
+        return p.y * p.y == p.x**3 + p.x * z4 * self.a + z4 * zz * self.b
+
+    def lift_x(self, x, sign):
+        """Recover the point of abscissa `x` whose ordinate has parity `sign`"""
+        F = self.F
+        y2 = x**3 + x * self.a + self.b
+        if self.sqrt_exp is None:
+            y = y2.sqrt()
+        else:
+            y = y2**self.sqrt_exp
+            if y * y != y2:
+                raise ValueError(f"{x} is not the abscissa of a point")
+        if (y.val & 1) != sign:
+            y = -y
+        return Point(self, x, y)
+
+    def multiples(self, P, k, step=1, batch=64):
+        """Generator of the affine points k.P, (k + step).P, (k + 2.step).P, ...
+        The first `batch` points cost the multiplications k.P and step.P (only
+        k.P for step = 1); each following batch is obtained by adding
+        (batch.step).P in affine coordinates with a single shared inversion"""
+        return _multiples(
+            P,
+            k,
+            step,
+            batch,
+            Point.complete_add_unsafe,
+            batch_to_affine,
+            batch_add_affine,
+        )
+
+    def decode_point(self, data):
+        """Decode a SEC1 (compressed or uncompressed) point encoding"""
+        n = self.size
+        if len(data) == 0:
+            raise ValueError("Empty point encoding")
+        prefix = data[0]
+        if prefix == 0 and len(data) == 1:
+            return Point(self, self.F(0), self.F(1), self.F(0))
+        if prefix in (2, 3) and len(data) == 1 + n:
+            x = int.from_bytes(data[1:], "big")
+            if x >= self.p:
+                raise ValueError("x coordinate out of range")
+            return self.lift_x(self.F(x), prefix & 1)
+        if prefix == 4 and len(data) == 1 + 2 * n:
+            x = int.from_bytes(data[1 : 1 + n], "big")
+            y = int.from_bytes(data[1 + n :], "big")
+            if x >= self.p or y >= self.p:
+                raise ValueError("Coordinate out of range")
+            P = Point(self, self.F(x), self.F(y))
+            if not self.is_on_curve(P):
+                raise ValueError("Point is not on the curve")
+            return P
+        raise ValueError(f"Invalid point encoding of length {len(data)}")
+
+    def decode_points(self, buf, errors=None):
+        """Decode concatenated SEC1 encodings from a bytes-like object (e.g. a
+        memoryview or an mmap) without copying each record.
+        Compressed, uncompressed and infinity encodings may be mixed.
+
+        By default decoding stops with a ValueError carrying the index of the
+        first invalid record. If a list `errors` is given, (index, ValueError)
+        pairs are appended to it instead, None is yielded in place of each
+        invalid point and decoding goes on. A record whose length cannot be
+        determined (unknown prefix, truncated buffer) always ends decoding."""
+        view = memoryview(buf).cast("B")
+        n = self.size
+        sizes = {0: 1, 2: 1 + n, 3: 1 + n, 4: 1 + 2 * n}
+        offset = 0
+        index = 0
+        while offset < len(view):
+            size = sizes.get(view[offset])
+            if size is None or offset + size > len(view):
+                msg = f"Invalid point encoding at record {index}"
+                if errors is None:
+                    raise ValueError(msg)
+                errors.append((index, ValueError(msg)))
+                return
+            try:
+                P = self.decode_point(view[offset : offset + size])
+            except ValueError as err:
+                msg = f"Invalid point encoding at record {index}: {err}"
+                if errors is None:
+                    raise ValueError(msg) from err
+                errors.append((index, ValueError(msg)))
+                P = None
+            yield P
+            offset += size
+            index += 1
 
 
 secp256k1 = WeierstrassCurve(
@@ -24,6 +145,7 @@ secp256k1 = WeierstrassCurve(
     0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141,
     0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798,
     0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8,
+    name="secp256k1",
 )
 
 secp521r1 = WeierstrassCurve(
@@ -33,19 +155,71 @@ secp521r1 = WeierstrassCurve(
     0x01FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFA51868783BF2F966B7FCC0148F709A5D03BB5C9B8899C47AEBB6FB71E91386409,
     0xC6858E06B70404E9CD9E3ECB662395B4429C648139053FB521F828AF606B4D3DBAA14B5E77EFE75928FE1DC127A2FFA8DE3348B3C1856A429BF97E7E31C2E5BD66,
     0x11839296A789A3BC0045C8A5FB42C7D1BD998F54449579B446817AFBD17273E662C97EE72995EF42640C550B9013FAD0761353C7086A272C24088BE94769FD16650,
+    name="secp521r1",
 )
 
+
+def _multiples(P, k, step, batch, add, to_affine, add_affine):
+    """Shared implementation of the `multiples` generators, `add` being the
+    projective addition and `to_affine`/`add_affine` the batched operations
+    of the curve model"""
+    S = P if step == 1 else step * P
+    lanes = [k * P]
+    for _ in range(batch - 1):
+        lanes.append(add(lanes[-1], S))
+    # (batch.step).P = lanes[-1] + S - lanes[0], normalised along with the lanes
+    D = add(add(lanes[-1], S), -lanes[0])
+    *lanes, D = to_affine(lanes + [D])
+    while True:
+        yield from lanes
+        lanes = add_affine(lanes, D)
+
+
 # Edwards : x^2 + y^2 = c^2.(1 + x^2.y^2)
 # Twisted : a.x^2 + y^2 = 1 + d.x^2.y^2
 class TwistedEdwardsCurve:
-    def __init__(self, q, order, d, a):
-        self.F = Field(q)
+    def __init__(self, q, order, d, a, gy=None, name=None, field=None):
+        self.F = Field(q) if field is None else field
+        self.name = name
         self.q = q
         self.r = order
         self.d = d
         self.a = self.F(a)
         self.d2 = d + d
         self.zero = EdwardsPoint(self, self.F(0), self.F(1), self.F(1))
+        if gy is not None:
+            y = self.F(gy)
+            self.G = EdwardsPoint(self, self.recover_x(y, 0), y)
+
+    def with_field(self, field):
+        """The same curve over another implementation of its base field (e.g. a `LimbField`)"""
+        gy = self.G.to_affine().y.val if hasattr(self, "G") else None
+        name = _field_name(self.name, self.q, field)
+        return TwistedEdwardsCurve(self.q, self.r, self.d, self.a.val, gy, name, field)
+
+    def is_on_curve(self, p):
+        """Check (a.X^2 + Y^2).Z^2 = Z^4 + d.X^2.Y^2 and X.Y = T.Z (extended coordinates)"""
+        xx = p.x * p.x
+        yy = p.y * p.y
+        zz = p.z * p.z
+        if (self.a * xx + yy) * zz != zz * zz + xx * yy * self.d:
+            return False
+        return p.x * p.y == p.t * p.z
+
+    def multiples(self, P, k, step=1, batch=64):
+        """Generator of the affine points k.P, (k + step).P, (k + 2.step).P, ...
+        The first `batch` points cost the multiplications k.P and step.P (only
+        k.P for step = 1); each following batch is obtained by adding
+        (batch.step).P in affine coordinates with a single shared inversion"""
+        return _multiples(
+            P,
+            k,
+            step,
+            batch,
+            EdwardsPoint.add,
+            edwards.batch_to_affine,
+            edwards.batch_add_affine,
+        )
 
     # https://tools.ietf.org/html/rfc8032  p.21
     # Compute corresponding x-coordinate, with low bit corresponding to
@@ -59,7 +233,7 @@ class TwistedEdwardsCurve:
             if sign:
                 return None
             else:
-                return 0
+                return F(0)
 
         # Compute square root of x2
         x = x2 ** ((self.q + 3) // 8)
@@ -79,6 +253,31 @@ ed25519 = TwistedEdwardsCurve(
     (1 << 252) + 27742317777372353535851937790883648493,
     0x52036CEE2B6FFE738CC740797779E89800700A4D4141D8AB75EB4DCA135978A3, # d = -F(121665) / F(121666)
     (1 << 255) - 19 - 1,
+    0x6666666666666666666666666666666666666666666666666666666666666658,  # 4/5
+    name="ed25519",
+)
+
+
+# Montgomery : B.y^2 = x^3 + A.x^2 + x
+class MontgomeryCurve:
+    def __init__(self, p, A, order, u, name=None):
+        self.F = Field(p)
+        self.name = name
+        self.p = p
+        self.A = self.F(A)
+        self.a24 = (A - 2) // 4
+        self.order = order
+        self.G = MontgomeryPoint(self, self.F(u))
+        self.zero = MontgomeryPoint(self, self.F(1), self.F(0))
+
+
+# Curve25519 : y^2 = x^3 + 486662.x^2 + x
+curve25519 = MontgomeryCurve(
+    (1 << 255) - 19,
+    486662,
+    (1 << 252) + 27742317777372353535851937790883648493,
+    9,
+    name="curve25519",
 )
 
 
@@ -107,3 +306,91 @@ def point_decompress(s):
     else:
         return EdwardsPoint(ed25519, x, y)
 
+
+def decode_scalar_25519(k):
+    """Scalar decoding (clamping) according to rfc7748"""
+    if len(k) != 32:
+        raise ValueError("Bad size of scalar")
+    s = int.from_bytes(k, "little")
+    s &= (1 << 254) - 8
+    s |= 1 << 254
+    return s
+
+
+def decode_u_coordinate(u):
+    """u-coordinate decoding according to rfc7748"""
+    if len(u) != 32:
+        raise ValueError("Bad size of u-coordinate")
+    return int.from_bytes(u, "little") & ((1 << 255) - 1)
+
+
+def encode_u_coordinate(u):
+    """u-coordinate encoding according to rfc7748"""
+    return (u % curve25519.p).to_bytes(32, "little")
+
+
+def x25519(k, u):
+    """X25519 function according to rfc7748"""
+    F = curve25519.F
+    P = MontgomeryPoint(curve25519, F(decode_u_coordinate(u)))
+    R = mont_ml(decode_scalar_25519(k), P)
+    # z^(p-2) maps the point at infinity to 0
+    return encode_u_coordinate((R.x * R.z ** (curve25519.p - 2)).val)
+
+
+def x25519_batch(scalars, u):
+    """X25519 of a common u-coordinate for many scalars, sharing a single inversion"""
+    F = curve25519.F
+    P = MontgomeryPoint(curve25519, F(decode_u_coordinate(u)))
+    R = [mont_ml(decode_scalar_25519(k), P) for k in scalars]
+    # the point at infinity encodes as 0
+    X = [F(0) if Q.is_at_infinity() else Q.x for Q in R]
+    Z = [F(1) if Q.is_at_infinity() else Q.z for Q in R]
+    return [encode_u_coordinate((x * iz).val) for x, iz in zip(X, batch_invert(Z))]
+
+
+def edwards_to_montgomery(P):
+    """Birational map from ed25519 to curve25519, u = (1 + y) / (1 - y),
+    computed projectively without inversion"""
+    return MontgomeryPoint(curve25519, P.z + P.y, P.z - P.y)
+
+
+# sqrt(-486664) with sgn0 = 0, for the map from curve25519 to ed25519 (rfc9380 D.1)
+_SQRT_M486664 = (-ed25519.F(486664)).sqrt()
+if _SQRT_M486664.val & 1:
+    _SQRT_M486664 = -_SQRT_M486664
+
+
+def montgomery_uv_to_edwards(s, t):
+    """Rational map from curve25519 (s, t) to ed25519 (rfc9380 D.1),
+    x = sqrt(-486664).s / t, y = (s - 1) / (s + 1), with a single constant-time
+    inversion. The exceptional points (t = 0 or s = -1) map to the identity"""
+    F = ed25519.F
+    tv1 = (s + F(1)) * t
+    tv1 = tv1 ** (F.mod - 2)  # inv0
+    v = tv1 * (s + F(1)) * s * _SQRT_M486664
+    w = tv1 * t * (s - F(1))
+    e = tv1 == F(0)
+    w = [w, F(1)][e]
+    return EdwardsPoint(ed25519, v, w)
+
+
+def montgomery_to_edwards(P, sign=0):
+    """Birational map from curve25519 to ed25519 for x-only points, which do not
+    carry the sign of x: it is given by `sign`"""
+    F = ed25519.F
+    if P.is_at_infinity():
+        return EdwardsPoint(ed25519, F(0), F(1))
+    u = F((P.x / P.z).val)
+    if u == F(-1):
+        raise ValueError("u = -1 has no image on ed25519")
+    if u == F(0):
+        # the point of order 2, exceptional for the rational map
+        return EdwardsPoint(ed25519, F(0), F(-1))
+    v2 = (u + curve25519.A) * u * u + u
+    if v2.legendre() == -1:
+        raise ValueError(f"{u} is not the u-coordinate of a point on curve25519")
+    Q = montgomery_uv_to_edwards(u, v2.sqrt())
+    if (Q.x.val & 1) != sign:
+        Q = -Q
+    return Q
@@ -1,8 +1,43 @@
 from __future__ import annotations
-from ..field import FieldElement
-from .mults import ml
+from ..field import FieldElement, batch_invert
+from .tune import scalar_mult
 from typing import List, Union
 
+
+def batch_to_affine(points: List[Point]) -> List[Point]:
+    """Convert points to affine representation with a single inversion
+    (points at infinity are left as they are)"""
+    izs = iter(batch_invert([P.z for P in points if not P.is_at_infinity()]))
+    res = []
+    for P in points:
+        if P.is_at_infinity():
+            res.append(P)
+            continue
+        iz = next(izs)
+        iz2 = iz * iz
+        res.append(Point(P.curve, P.x * iz2, P.y * iz2 * iz))
+    return res
+
+
+def batch_add_affine(points: List[Point], Q: Point) -> List[Point]:
+    """Add the affine point Q to each of the affine `points`, sharing a single inversion"""
+    if Q.is_at_infinity():
+        return list(points)
+    # exceptional cases (P at infinity, P = +-Q) are left to the complete addition
+    regular = [not P.is_at_infinity() and P.x != Q.x for P in points]
+    inv = iter(batch_invert([Q.x - P.x for P, r in zip(points, regular) if r]))
+    res = []
+    for P, r in zip(points, regular):
+        if r:
+            l = (Q.y - P.y) * next(inv)
+            x = l * l - P.x - Q.x
+            res.append(Point(P.curve, x, l * (P.x - x) - P.y))
+        else:
+            R = P.complete_add_unsafe(Q)
+            res.append(R if R.is_at_infinity() else R.to_affine())
+    return res
+
+
 class Point:
     """Point on a weierstrass-form elliptic curve"""
 
@@ -18,14 +53,40 @@ class Point:
             raise ValueError("Curve undefined")
         else:
             self.a = curve.a
+        self._hash = None
 
     def __repr__(self):
         return f"({self.x} : {self.y} : {self.z})"
 
     def __eq__(self, Q: Point):
-        A = self.to_affine()
-        B = Q.to_affine()
-        return A.x == B.x and A.y == B.y
+        """Inversion-free comparison: X1.Z2^2 = X2.Z1^2 and Y1.Z2^3 = Y2.Z1^3"""
+        if not isinstance(Q, Point):
+            return NotImplemented
+        inf_s = self.is_at_infinity()
+        inf_q = Q.is_at_infinity()
+        if inf_s or inf_q:
+            return inf_s and inf_q
+        zz_s = self.z * self.z
+        zz_q = Q.z * Q.z
+        if self.x * zz_q != Q.x * zz_s:
+            return False
+        return self.y * zz_q * Q.z == Q.y * zz_s * self.z
+
+    def __setattr__(self, name, value):
+        # assigning a coordinate invalidates the cached hash
+        if name in ("x", "y", "z"):
+            object.__setattr__(self, "_hash", None)
+        object.__setattr__(self, name, value)
+
+    def __hash__(self):
+        # the normalised (affine) form is computed once per point
+        if self._hash is None:
+            if self.is_at_infinity():
+                self._hash = hash(())
+            else:
+                A = self.to_affine()
+                self._hash = hash((A.x, A.y))
+        return self._hash
 
     def __neg__(self):
         return Point(self.curve, self.x, -self.y, self.z)
@@ -43,7 +104,8 @@ class Point:
             x = s
         if x == 2:
             return self.j_dbl()
-        return ml(x, self).to_affine()
+        R = scalar_mult(x, self)
+        return R if R.is_at_infinity() else R.to_affine()
 
     def __rmul__(self, s: Union[FieldElement, int]):
         return self.__mul__(s)
@@ -228,6 +290,22 @@ class Point:
         iz = ~self.z
         return Point(self.curve, self.x * iz**2, self.y * iz**3)
 
+    def encode(self, compressed: bool = True) -> bytes:
+        """SEC1 encoding of this point"""
+        if self.is_at_infinity():
+            return b"\x00"
+        n = self.curve.size
+        A = self.to_affine()
+        x = A.x.val.to_bytes(n, "big")
+        if compressed:
+            return bytes([2 | (A.y.val & 1)]) + x
+        return b"\x04" + x + A.y.val.to_bytes(n, "big")
+
+    @staticmethod
+    def decode(curve, data) -> Point:
+        """Decode a SEC1 point encoding on `curve`"""
+        return curve.decode_point(data)
+
     def is_at_infinity(self) -> bool:
         """whether this point is 'zero'"""
-        return self.z.val == 0
+        return self.z == self.z.field(0)
@@ -0,0 +1,127 @@
+""" ECDSA over Weierstrass curves
+
+Verification computes u1.G + u2.Q with an interleaved fixed-window method.
+The per-key window tables [0, Q, 2Q, ..., (2^w - 1)Q] are kept in a bounded
+LRU cache (`KeyTableCache`) so repeated verifications under the same public
+key skip the precomputation.
+"""
+import hashlib
+from collections import OrderedDict
+from secrets import randbelow
+from ..field import Field
+from .ecc import batch_to_affine
+
+
+class KeyTableCache:
+    """Bounded LRU cache of window tables, keyed by point"""
+
+    def __init__(self, w=4, maxsize=64):
+        self.w = w
+        self.maxsize = maxsize
+        self.tables = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.tables)
+
+    def table(self, Q):
+        """Window table of Q: [None (zero), Q, 2Q, ..., (2^w - 1)Q]"""
+        T = self.tables.get(Q)
+        if T is not None:
+            self.hits += 1
+            self.tables.move_to_end(Q)
+            return T
+        self.misses += 1
+        T = [None, Q]
+        for i in range(2, 1 << self.w):
+            T.append(2 * T[i >> 1] if i % 2 == 0 else T[i - 1] + Q)
+        T[2:] = batch_to_affine(T[2:])
+        self.tables[Q] = T
+        if len(self.tables) > self.maxsize:
+            self.tables.popitem(last=False)
+        return T
+
+    def clear(self):
+        self.tables.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+key_tables = KeyTableCache()
+
+_scalar_fields = {}
+
+
+def scalar_field(curve):
+    """Field modulo the curve order"""
+    if curve.order not in _scalar_fields:
+        _scalar_fields[curve.order] = Field(curve.order)
+    return _scalar_fields[curve.order]
+
+
+def hash_to_int(curve, msg, hashfunc=hashlib.sha256):
+    """Leftmost bits of the message digest, as many as in the curve order"""
+    h = int.from_bytes(hashfunc(msg).digest(), "big")
+    excess = hashfunc().digest_size * 8 - curve.order.bit_length()
+    if excess > 0:
+        h >>= excess
+    return h
+
+
+def public_key(curve, d):
+    """Public key d.G"""
+    return d * curve.G
+
+
+def sign(curve, d, msg, hashfunc=hashlib.sha256, k=None):
+    """Sign `msg` with the private key `d`, returning (r, s)"""
+    Fn = scalar_field(curve)
+    e = Fn(hash_to_int(curve, msg, hashfunc))
+    while True:
+        nonce = k if k is not None else 1 + randbelow(curve.order - 1)
+        R = nonce * curve.G
+        r = Fn(R.x.val)
+        if r.val != 0:
+            s = (e + r * d) / Fn(nonce)
+            if s.val != 0:
+                return r.val, s.val
+        if k is not None:
+            raise ValueError("Bad nonce")
+
+
+def joint_mult(u1, P, u2, Q, cache=key_tables):
+    """u1.P + u2.Q with interleaved fixed windows taken from `cache`"""
+    w = cache.w
+    TP = cache.table(P)
+    TQ = cache.table(Q)
+    mask = (1 << w) - 1
+    R = None
+    for i in range(-(-max(u1.bit_length(), u2.bit_length()) // w) - 1, -1, -1):
+        if R is not None:
+            for _ in range(w):
+                R = 2 * R
+        for u, T in ((u1, TP), (u2, TQ)):
+            d = (u >> (w * i)) & mask
+            if d:
+                R = T[d] if R is None else R.complete_add_unsafe(T[d])
+    return R
+
+
+def verify(curve, Q, msg, sig, hashfunc=hashlib.sha256, cache=key_tables):
+    """Verify the signature `sig` = (r, s) of `msg` under the public key `Q`"""
+    r, s = sig
+    n = curve.order
+    if not (0 < r < n and 0 < s < n):
+        return False
+    if Q.is_at_infinity() or not curve.is_on_curve(Q):
+        return False
+    Fn = scalar_field(curve)
+    e = Fn(hash_to_int(curve, msg, hashfunc))
+    w = ~Fn(s)
+    u1 = e * w
+    u2 = Fn(r) * w
+    R = joint_mult(u1.val, curve.G, u2.val, Q, cache)
+    if R is None or R.is_at_infinity():
+        return False
+    return R.to_affine().x.val % n == r
@@ -1,4 +1,6 @@
-from ..field import FieldElement
+from typing import List
+from ..field import FieldElement, batch_invert
+from .tune import scalar_mult
 
 
 class EdwardsPoint:
@@ -21,14 +23,29 @@ class EdwardsPoint:
             self.t = self.x * self.y
         else:
             self.t = t
+        self._hash = None
 
     def __repr__(self):
         return f"({self.x} : {self.y} : {self.z})"
 
     def __eq__(self, Q):
-        A = self.to_affine()
-        B = Q.to_affine()
-        return A.x == B.x and A.y == B.y
+        """Inversion-free comparison: X1.Z2 = X2.Z1 and Y1.Z2 = Y2.Z1"""
+        if not isinstance(Q, EdwardsPoint):
+            return NotImplemented
+        return self.x * Q.z == Q.x * self.z and self.y * Q.z == Q.y * self.z
+
+    def __setattr__(self, name, value):
+        # assigning a coordinate invalidates the cached hash
+        if name in ("x", "y", "z", "t"):
+            object.__setattr__(self, "_hash", None)
+        object.__setattr__(self, name, value)
+
+    def __hash__(self):
+        # the normalised (affine) form is computed once per point
+        if self._hash is None:
+            A = self.to_affine()
+            self._hash = hash((A.x, A.y))
+        return self._hash
 
     def __neg__(self):
         return EdwardsPoint(self.curve, -self.x, self.y, self.z, -self.t)
@@ -36,6 +53,9 @@ class EdwardsPoint:
     def __add__(self, Q):
         return self.add(Q).to_affine()
 
+    def __sub__(self, Q):
+        return self.add(-Q).to_affine()
+
     ## FIXME
     # def __rmul__(self, s):
     #     # r = Edwardspoint(self.curve,)
@@ -48,19 +68,9 @@ class EdwardsPoint:
     #     return r.to_affine()
 
     def __rmul__(self, k):
-        r = self.curve.zero
-        s = self
         if isinstance(k, FieldElement):
-            k_ = k.val
-        else:
-            k_ = k
-        for i in bin(k_)[2:][::-1]:
-            if int(i, 2):
-                r = r.add(s)
-            # t = s
-            # s = t.add(s) ## FIXME
-            s = s.idbl()
-        return r.to_affine()
+            k = k.val
+        return scalar_mult(k, self).to_affine()
 
     # Using extended coordinates
     def to_affine(self):
@@ -105,3 +115,29 @@ class EdwardsPoint:
         T3 = E * H
         Z3 = FF * G
         return EdwardsPoint(self.curve, X3, Y3, Z3, T3)
+
+
+def batch_to_affine(points: List[EdwardsPoint]) -> List[EdwardsPoint]:
+    """Convert points to affine representation with a single inversion"""
+    izs = batch_invert([P.z for P in points])
+    return [EdwardsPoint(P.curve, P.x * iz, P.y * iz) for P, iz in zip(points, izs)]
+
+
+def batch_add_affine(points: List[EdwardsPoint], Q: EdwardsPoint) -> List[EdwardsPoint]:
+    """Add the affine point Q to each of the affine `points`, sharing a single inversion
+    x3 = (x1.y2 + y1.x2) / (1 + d.x1.x2.y1.y2), y3 = (y1.y2 - a.x1.x2) / (1 - d.x1.x2.y1.y2)"""
+    if len(points) == 0:
+        return []
+    one = Q.x.field(1)
+    dens = []
+    for P in points:
+        t = P.x * Q.x * P.y * Q.y * P.curve.d
+        dens.append(one + t)
+        dens.append(one - t)
+    invs = batch_invert(dens)
+    res = []
+    for i, P in enumerate(points):
+        x = (P.x * Q.y + P.y * Q.x) * invs[2 * i]
+        y = (P.y * Q.y - P.curve.a * P.x * Q.x) * invs[2 * i + 1]
+        res.append(EdwardsPoint(P.curve, x, y))
+    return res
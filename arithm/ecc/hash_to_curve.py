@@ -0,0 +1,225 @@
+""" Hashing to elliptic curves according to rfc9380
+
+Supported suites:
+- secp256k1_XMD:SHA-256_SSWU_RO_ (simplified SWU on a 3-isogenous curve, as a = 0)
+- P521_XMD:SHA-512_SSWU_RO_ (simplified SWU)
+- edwards25519_XMD:SHA-512_ELL2_RO_ (Elligator 2 on curve25519, mapped to ed25519)
+
+and their encode_to_curve (_NU_) counterparts.
+"""
+import hashlib
+from secrets import token_bytes
+from ..field import sqrt_ratio
+from .ecc import Point
+from .edwards import EdwardsPoint
+from .curves import secp256k1, secp521r1, ed25519, montgomery_uv_to_edwards
+
+# secp256k1: E': y^2 = x^3 + A'.x + B' and its 3-isogeny to secp256k1 (rfc9380 E.1)
+SECP256K1_ISO_A = 0x3F8731ABDD661ADCA08A5558F0F5D272E953D363CB6F0E5D405447C01A444533
+SECP256K1_ISO_B = 1771
+SECP256K1_ISO_MAP = (
+    # x numerator
+    (
+        0x8E38E38E38E38E38E38E38E38E38E38E38E38E38E38E38E38E38E38DAAAAA8C7,
+        0x07D3D4C80BC321D5B9F315CEA7FD44C5D595D2FC0BF63B92DFFF1044F17C6581,
+        0x534C328D23F234E6E2A413DECA25CAECE4506144037C40314ECBD0B53D9DD262,
+        0x8E38E38E38E38E38E38E38E38E38E38E38E38E38E38E38E38E38E38DAAAAA88C,
+    ),
+    # x denominator
+    (
+        0xD35771193D94918A9CA34CCBB7B640DD86CD409542F8487D9FE6B745781EB49B,
+        0xEDADC6F64383DC1DF7C4B2D51B54225406D36B641F5E41BBC52A56612A8C6D14,
+        1,
+    ),
+    # y numerator
+    (
+        0x4BDA12F684BDA12F684BDA12F684BDA12F684BDA12F684BDA12F684B8E38E23C,
+        0xC75E0C32D5CB7C0FA9D0A54B12A0A6D5647AB046D686DA6FDFFC90FC201D71A3,
+        0x29A6194691F91A73715209EF6512E576722830A201BE2018A765E85A9ECEE931,
+        0x2F684BDA12F684BDA12F684BDA12F684BDA12F684BDA12F684BDA12F38E38D84,
+    ),
+    # y denominator
+    (
+        0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEFFFFF93B,
+        0x7A06534BB8BDB49FD5E9E6632722C2989467C1BFC8E8D978DFB425D2685C2573,
+        0x6484AA716545CA2CF3A70C3FA8FE337E0A3D21162F0D6299A7BF8192BFD2A76F,
+        1,
+    ),
+)
+
+
+class Suite:
+    """Parameters of a hash-to-curve suite"""
+
+    def __init__(self, name, curve, hashfunc, L, Z, kind):
+        self.name = name
+        self.curve = curve
+        self.hashfunc = hashfunc
+        # bytes per field element in hash_to_field
+        self.L = L
+        self.Z = curve.F(Z)
+        # "sswu", "sswu_iso" or "ell2"
+        self.kind = kind
+
+
+SUITES = {
+    "secp256k1": Suite(
+        "secp256k1_XMD:SHA-256_SSWU_RO_", secp256k1, hashlib.sha256, 48, -11, "sswu_iso"
+    ),
+    "secp521r1": Suite(
+        "P521_XMD:SHA-512_SSWU_RO_", secp521r1, hashlib.sha512, 98, -4, "sswu"
+    ),
+    "ed25519": Suite(
+        "edwards25519_XMD:SHA-512_ELL2_RO_", ed25519, hashlib.sha512, 48, 2, "ell2"
+    ),
+}
+
+
+def expand_message_xmd(msg, dst, length, hashfunc):
+    """expand_message_xmd (rfc9380 5.3.1)"""
+    b_in_bytes = hashfunc().digest_size
+    s_in_bytes = hashfunc().block_size
+    ell = -(-length // b_in_bytes)
+    if ell > 255 or length > 65535 or len(dst) > 255:
+        raise ValueError("expand_message_xmd: invalid lengths")
+    dst_prime = dst + bytes([len(dst)])
+    msg_prime = bytes(s_in_bytes) + msg + length.to_bytes(2, "big") + b"\x00" + dst_prime
+    b0 = hashfunc(msg_prime).digest()
+    b = [hashfunc(b0 + b"\x01" + dst_prime).digest()]
+    for i in range(2, ell + 1):
+        x = bytes(u ^ v for u, v in zip(b0, b[-1]))
+        b.append(hashfunc(x + bytes([i]) + dst_prime).digest())
+    return b"".join(b)[:length]
+
+
+def hash_to_field(suite, msg, dst, count):
+    """hash_to_field (rfc9380 5.2)"""
+    L = suite.L
+    uniform = expand_message_xmd(msg, dst, count * L, suite.hashfunc)
+    F = suite.curve.F
+    return [F(int.from_bytes(uniform[i * L : (i + 1) * L], "big")) for i in range(count)]
+
+
+def inv0(x):
+    """Constant-time inversion x^(p - 2) (rfc9380 4), mapping 0 to 0"""
+    return x ** (x.field.mod - 2)
+
+
+def map_to_curve_sswu(u, A, B, Z):
+    """Simplified SWU map to y^2 = x^3 + A.x + B (rfc9380 F.2), returns (x, y)"""
+    F = u.field
+    tv1 = u * u
+    tv1 = Z * tv1
+    tv2 = tv1 * tv1
+    tv2 = tv2 + tv1
+    tv3 = tv2 + F(1)
+    tv3 = B * tv3
+    tv4 = [Z, -tv2][tv2.val != 0]
+    tv4 = A * tv4
+    tv2 = tv3 * tv3
+    tv6 = tv4 * tv4
+    tv5 = A * tv6
+    tv2 = tv2 + tv5
+    tv2 = tv2 * tv3
+    tv6 = tv6 * tv4
+    tv5 = B * tv6
+    tv2 = tv2 + tv5
+    x = tv1 * tv3
+    is_gx1_square, y1 = sqrt_ratio(tv2, tv6, Z)
+    y = tv1 * u
+    y = y * y1
+    x = [x, tv3][is_gx1_square]
+    y = [y, y1][is_gx1_square]
+    y = [-y, y][(u.val & 1) == (y.val & 1)]
+    x = x * inv0(tv4)
+    return x, y
+
+
+def iso_map_secp256k1(x, y):
+    """3-isogeny from E' to secp256k1"""
+    F = x.field
+    values = []
+    for coeffs in SECP256K1_ISO_MAP:
+        acc = F(coeffs[-1])
+        for c in coeffs[-2::-1]:
+            acc = acc * x + F(c)
+        values.append(acc)
+    x_num, x_den, y_num, y_den = values
+    return x_num * inv0(x_den), y * y_num * inv0(y_den)
+
+
+def map_to_curve_elligator2(u, Z):
+    """Elligator 2 map to curve25519 (rfc9380 6.7.1, J = 486662, K = 1), returns (s, t)"""
+    F = u.field
+    c1 = F(486662)
+    tv1 = u * u
+    tv1 = Z * tv1
+    tv1 = [tv1, F(0)][tv1 == F(-1)]
+    x1 = tv1 + F(1)
+    x1 = inv0(x1)
+    x1 = -c1 * x1
+    gx1 = x1 + c1
+    gx1 = gx1 * x1
+    gx1 = gx1 + F(1)
+    gx1 = gx1 * x1
+    x2 = -x1 - c1
+    gx2 = tv1 * gx1
+    e2 = gx1 ** ((F.mod - 1) // 2) != F(-1)  # is_square
+    x = [x2, x1][e2]
+    y2 = [gx2, gx1][e2]
+    y = sqrt_ratio(y2, F(1), Z)[1]
+    e3 = (y.val & 1) == 1
+    y = [y, -y][e2 ^ e3]
+    return x, y
+
+
+def map_to_curve(suite, u):
+    """Map a field element to a point of the suite's curve"""
+    if suite.kind == "ell2":
+        return montgomery_uv_to_edwards(*map_to_curve_elligator2(u, suite.Z))
+    curve = suite.curve
+    if suite.kind == "sswu_iso":
+        F = curve.F
+        x, y = map_to_curve_sswu(u, F(SECP256K1_ISO_A), F(SECP256K1_ISO_B), suite.Z)
+        x, y = iso_map_secp256k1(x, y)
+    else:
+        x, y = map_to_curve_sswu(u, curve.a, curve.b, suite.Z)
+    return Point(curve, x, y)
+
+
+def clear_cofactor(suite, P):
+    if suite.kind == "ell2":
+        # h_eff = 8
+        return P.idbl().idbl().idbl()
+    return P
+
+
+def _suite(curve):
+    if curve.name not in SUITES:
+        raise ValueError(f"No hash-to-curve suite for {curve.name}")
+    return SUITES[curve.name]
+
+
+def _add(P, Q):
+    if isinstance(P, EdwardsPoint):
+        return P.add(Q)
+    return P.complete_add_unsafe(Q)
+
+
+def hash_to_curve(curve, msg, dst):
+    """Random-oracle encoding of `msg` to a point of `curve`"""
+    suite = _suite(curve)
+    u0, u1 = hash_to_field(suite, msg, dst, 2)
+    return clear_cofactor(suite, _add(map_to_curve(suite, u0), map_to_curve(suite, u1)))
+
+
+def encode_to_curve(curve, msg, dst):
+    """Nonuniform encoding of `msg` to a point of `curve` (a single map evaluation)"""
+    suite = _suite(curve)
+    (u,) = hash_to_field(suite, msg, dst, 1)
+    return clear_cofactor(suite, map_to_curve(suite, u))
+
+
+def random_point(curve):
+    """A random point of unknown discrete logarithm"""
+    return encode_to_curve(curve, token_bytes(32), b"arithm-random-point")
@@ -0,0 +1,74 @@
+from __future__ import annotations
+from ..field import FieldElement
+
+
+class MontgomeryPoint:
+    """x-only point (X : Z) on a Montgomery-form elliptic curve B.y^2 = x^3 + A.x^2 + x"""
+
+    def __init__(self, curve, x: FieldElement, z: FieldElement = None):
+        self.curve = curve
+        self.x = x
+        if z is None:
+            self.z = x.field(1)
+        else:
+            self.z = z
+        self._hash = None
+
+    def __repr__(self):
+        return f"({self.x} : {self.z})"
+
+    def __eq__(self, Q: MontgomeryPoint):
+        # x-only points are equal up to sign
+        if not isinstance(Q, MontgomeryPoint):
+            return NotImplemented
+        return self.x * Q.z == Q.x * self.z
+
+    def __setattr__(self, name, value):
+        # assigning a coordinate invalidates the cached hash
+        if name in ("x", "z"):
+            object.__setattr__(self, "_hash", None)
+        object.__setattr__(self, name, value)
+
+    def __hash__(self):
+        # the normalised (affine) form is computed once per point
+        if self._hash is None:
+            if self.is_at_infinity():
+                self._hash = hash(())
+            else:
+                self._hash = hash(self.to_affine().x.val)
+        return self._hash
+
+    def xdbl(self) -> MontgomeryPoint:
+        """x-only doubling (2M + 2S + 1 multiplication by (A-2)/4)"""
+        A = self.x + self.z
+        AA = A * A
+        B = self.x - self.z
+        BB = B * B
+        E = AA - BB
+        X2 = AA * BB
+        Z2 = E * (AA + E * self.curve.a24)
+        return MontgomeryPoint(self.curve, X2, Z2)
+
+    def xadd(self, Q: MontgomeryPoint, diff: MontgomeryPoint) -> MontgomeryPoint:
+        """Differential addition, `diff` being self - Q (3M + 2S when diff is affine)"""
+        A = self.x + self.z
+        B = self.x - self.z
+        C = Q.x + Q.z
+        D = Q.x - Q.z
+        DA = D * A
+        CB = C * B
+        X3 = DA + CB
+        X3 = X3 * X3
+        Z3 = DA - CB
+        Z3 = diff.x * (Z3 * Z3)
+        if diff.z.val != 1:
+            X3 = X3 * diff.z
+        return MontgomeryPoint(self.curve, X3, Z3)
+
+    def to_affine(self) -> MontgomeryPoint:
+        """Convert this point to affine representation (x : 1)"""
+        return MontgomeryPoint(self.curve, self.x / self.z)
+
+    def is_at_infinity(self) -> bool:
+        """whether this point is 'zero'"""
+        return self.z.val == 0
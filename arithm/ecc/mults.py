@@ -22,7 +22,7 @@ def bits_double(k, r):
 
 
 def coz_ml(k, P):
-    """CoZ Montgomery Ladder"""
+    """CoZ Montgomery Ladder (P affine)"""
     R = P.dblu()
     for b in bits(k)[::-1][1:]:
         R[1 - b], R[b] = R[b].zaddc(R[1 - b])
@@ -39,6 +39,35 @@ def ml(k, P):
     return R[0]
 
 
+def mont_ml(k, P):
+    """x-only Montgomery Ladder (Montgomery curves, P affine)"""
+    R = [P.curve.zero, P]
+    for b in bits(k)[::-1]:
+        R[1 - b] = R[0].xadd(R[1], P)
+        R[b] = R[b].xdbl()
+    return R[0]
+
+
+def edwards_r2l(k, P):
+    """Right-to-left double-and-add on extended Edwards coordinates"""
+    R = P.curve.zero
+    for b in bits(k):
+        if b:
+            R = R.add(P)
+        P = P.idbl()
+    return R
+
+
+def edwards_ml_const(k, P, n):
+    """Fixed-length (n bits) Montgomery ladder on extended Edwards coordinates.
+    The unified addition is complete, so no step needs a special case"""
+    R = [P.curve.zero, P]
+    for b in bits_const(k, n)[::-1]:
+        R[1 - b] = R[0].add(R[1])
+        R[b] = R[b].idbl()
+    return R[0]
+
+
 def straus(k, P, r, Q):
     """Straus-Shamir trick for double-base multiplication"""
     s = bits_double(k, r)[::-1]
@@ -97,40 +126,107 @@ def r2l_daa(k, n, P):
     return R[1]
 
 
-def r2l_daa_w(k, n, P, w):
-    """Windowed Right-to-left double-and-add"""
-    R = [P for i in range(1 << w)]
-    B = 2 * P
-    kbits = bits_const(k, n + 1 + (w - n % w))
-    for i in range(1, len(kbits), w):
-        b = 0
-        for j in range(w - 1, -1, -1):
-            b <<= 1
-            b |= kbits[i + j]
-        R[b] += B
-        for j in range(w):
-            B = 2 * B
+def regular_recode(k, n, w):
+    """Joye-Tunstall regular recoding of the odd scalar 'k' < 2^n (LSB first).
+    Returns ceil(n/w) digits, all odd, in [-(2^w - 1), 2^w - 1]"""
+    if k & 1 == 0:
+        raise ValueError("Regular recoding requires an odd scalar")
+    digits = []
+    for _ in range(-(-n // w) - 1):
+        d = (k & ((1 << (w + 1)) - 1)) - (1 << w)
+        digits.append(d)
+        k = (k - d) >> w
+    digits.append(k)
+    return digits
+
+
+def r2l_regular_w(k, n, P, w):
+    """Regular windowed right-to-left double-and-add (Yao's bucket method
+    over a Joye-Tunstall signed odd-digit recoding)"""
+    # Recode k + 1 if k is even, and subtract P from a fake register at the end
+    b = 1 - (k & 1)
+    digits = regular_recode(k + b, n + 1, w)
+
+    # One bucket per odd digit magnitude 2m+1. Buckets start at 2P so that
+    # the first addition (of +-P) is never a doubling or a point at infinity,
+    # nor any later one as |bucket| < 2^(w.i) while the accumulator is 2^(w.i).P
+    D = 2 * P
+    R = [D for _ in range(1 << (w - 1))]
+    B = P
+    for i, d in enumerate(digits):
+        if i:
+            for _ in range(w):
+                B = 2 * B
+        if d < 0:
+            R[-d >> 1] += -B
+        else:
+            R[d >> 1] += B
+
+    # Aggregate sum((2m+1).R[m]) = 2.sum(m.R[m]) + sum(R[m]) with running sums.
+    # Buckets that received no digit are all equal (2P), and running sums may
+    # coincide, so the aggregation uses complete additions
+    S = R[-1]
+    if len(R) > 1:
+        T = S
+        for m in range(len(R) - 2, 0, -1):
+            S = S.complete_add_unsafe(R[m])
+            T = T.complete_add_unsafe(S)
+        S = (2 * T).complete_add_unsafe(S).complete_add_unsafe(R[0])
+
+    # Remove the bucket offsets sum((2m+1).2P) = 2^(2w-1).P
+    C = P
+    for _ in range(2 * w - 1):
+        C = 2 * C
+    Q = S.complete_add_unsafe(-C)
+    Q = [Q, Q]  # [ Fake, Result ]
+    Q[b] = Q[b] - P
+    return Q[1]
+
+
+def r2l_regular_w_cost(n, w):
+    """Number of point additions and doublings of `r2l_regular_w` for n-bit scalars
+
+    | w | add (n=256) | dbl (n=256) |
+    |---|-------------|-------------|
+    | 1 |         259 |         258 |
+    | 2 |         133 |         261 |
+    | 3 |          94 |         262 |
+    | 4 |          81 |         265 |
+    | 5 |          84 |         266 |
+    | 6 |         107 |         265 |
+    | 7 |         165 |         267 |
+    | 8 |         289 |         273 |
+    """
+    d = -(-(n + 1) // w)
+    add = d + (1 << w)
+    dbl = 1 + (d - 1) * w + (1 if w > 1 else 0) + 2 * w - 1
+    return {"add": add, "dbl": dbl}
 
-    for i in range(2, 1 << w):
-        R[1] += i * R[i]
 
-    R[1] -= 27 * P
-    b = 1 - kbits[0]
-    R[b] = R[b] - P
-    return R[1]
+def r2l_daa_w(k, n, P, w):
+    """Windowed Right-to-left double-and-add"""
+    return r2l_regular_w(k, n, P, w)
 
 
-def r2l_daa_point_blinding(k, n, P):
+def r2l_daa_point_blinding(k, n, P, Q=None):
     """Right-to-left double-and-add with point blinding"""
     # Assuming we have precomputed some random point that
     # is different from any intermediate value and avoids adding
     # two identical points during the algorithm.
     # Picking a point at random has no guarantee beyond statistical.
 
-    # Below can be replaced with a much cheaper point mapping algorithm
-    # like SWU or Icart
-    r = getrandbits(32)
-    Q = ml(r, P)
+    # By default Q is obtained with a point mapping algorithm (SWU / Elligator 2)
+    # when P's curve has a hash-to-curve suite, which is much cheaper than a
+    # scalar multiplication; other curves fall back to a random multiple of P
+    if Q is None:
+        # imported here as hash_to_curve depends on the curves, which depend on mults
+        from .hash_to_curve import SUITES, random_point
+
+        suite = SUITES.get(P.curve.name)
+        if suite is not None and suite.curve is P.curve:
+            Q = random_point(P.curve)
+        else:
+            Q = ml(getrandbits(32), P)
 
     R = [Q, Q]  # [ Fake, Result ]
     B = P
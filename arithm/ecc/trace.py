@@ -0,0 +1,274 @@
+""" Simulated side-channel traces of scalar multiplications
+
+While a `TraceRecorder` records a computation, every field operation result is
+turned into leakage samples by a leakage model (e.g. `HammingWeight`,
+`LimbHammingWeight`) and every point formula call is logged. Traces are
+streamed to disk through memory-mapped windows of fixed size, so the number of
+traces is bounded by disk space only:
+
+    with TraceRecorder("/tmp/ladder", LimbHammingWeight(F)) as rec:
+        for k in scalars:
+            rec.record(ml_const, k, P, n)
+    traces = load("/tmp/ladder")
+    traces.samples[traces.index[i, 0] : traces.index[i, 1]]  # trace i
+
+Files written for a prefix:
+
+    {prefix}.samples: leakage samples, one row of `model.width` values per field operation
+    {prefix}.ops:     operation code of each row, indexing OPS
+    {prefix}.calls:   (formula code indexing FORMULAS, first sample row) per formula call
+    {prefix}.index:   (sample start, sample end, call start, call end) per trace
+    {prefix}.json:    dtypes, shapes and names
+
+Samples are noise-free; noise can be added when the traces are loaded.
+Requires numpy.
+"""
+import json
+from contextlib import contextmanager
+import numpy as np
+from .. import field as _field
+from .ecc import Point
+from .edwards import EdwardsPoint
+from .montgomery import MontgomeryPoint
+
+OPS = "MSAIE"
+
+# Point formulas whose calls are logged
+FORMULAS = [
+    (cls, name)
+    for cls, names in (
+        (
+            Point,
+            (
+                "j_dbl",
+                "j_add",
+                "complete_add_unsafe",
+                "dblu",
+                "dblu_r",
+                "dblu_z",
+                "zaddc",
+                "zaddu",
+                "to_affine",
+            ),
+        ),
+        (EdwardsPoint, ("add", "idbl", "to_affine")),
+        (MontgomeryPoint, ("xdbl", "xadd", "to_affine")),
+    )
+    for name in names
+]
+
+
+def _popcount(x):
+    return bin(x).count("1")
+
+
+class HammingWeight:
+    """Hamming weight of the (canonical) value"""
+
+    width = 1
+
+    def __repr__(self):
+        return "HammingWeight()"
+
+    def __call__(self, x):
+        return (_popcount(x.val),)
+
+
+class LimbHammingWeight:
+    """Hamming weight of each `word`-bit limb of the value, one sample per limb
+
+    For a `LimbField` the limbs of the stored representation (Montgomery form
+    included) are used and `word` defaults to the field word size.
+    """
+
+    def __init__(self, field, word=None):
+        self.limbs = hasattr(field, "word")
+        self.word = word if word is not None else field.word if self.limbs else 32
+        if self.limbs and self.word != field.word:
+            raise ValueError(f"{field} has {field.word}-bit limbs")
+        self.mask = (1 << self.word) - 1
+        self.width = -(-field.mod.bit_length() // self.word)
+
+    def __repr__(self):
+        return f"LimbHammingWeight(word={self.word}, width={self.width})"
+
+    def __call__(self, x):
+        if self.limbs:
+            return [_popcount(l) for l in x.limbs]
+        v = x.val
+        return [_popcount((v >> (self.word * i)) & self.mask) for i in range(self.width)]
+
+
+class ChunkedWriter:
+    """Append-only array file, written through a memory-mapped window of `chunk` rows"""
+
+    def __init__(self, path, dtype, width=None, chunk=1 << 16):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.shape = () if width is None else (width,)
+        self.rowsize = self.dtype.itemsize * (1 if width is None else width)
+        self.chunk = chunk
+        self.size = 0
+        self.start = 0
+        self.window = None
+        open(path, "wb").close()
+
+    def _next_window(self):
+        if self.window is not None:
+            self.window.flush()
+        self.start = self.size
+        with open(self.path, "r+b") as f:
+            f.truncate((self.start + self.chunk) * self.rowsize)
+        self.window = np.memmap(
+            self.path,
+            self.dtype,
+            "r+",
+            offset=self.start * self.rowsize,
+            shape=(self.chunk,) + self.shape,
+        )
+
+    def append(self, row):
+        i = self.size - self.start
+        if self.window is None or i == self.chunk:
+            self._next_window()
+            i = 0
+        self.window[i] = row
+        self.size += 1
+
+    def close(self):
+        """Flush and cut the file to the rows written"""
+        if self.window is not None:
+            self.window.flush()
+            self.window = None
+        with open(self.path, "r+b") as f:
+            f.truncate(self.size * self.rowsize)
+
+
+class TraceRecorder:
+    """Record leakage traces into the files {prefix}.* (see the module documentation)
+
+    model: leakage model, a callable mapping a field element to `model.width` samples
+    dtype: sample type, large enough for the values of the model
+    chunk: rows per memory-mapped window
+    """
+
+    def __init__(self, prefix, model=None, dtype="uint16", chunk=1 << 16):
+        self.prefix = prefix
+        self.model = HammingWeight() if model is None else model
+        self.samples = ChunkedWriter(f"{prefix}.samples", dtype, self.model.width, chunk)
+        self.ops = ChunkedWriter(f"{prefix}.ops", "uint8", None, chunk)
+        self.calls = ChunkedWriter(f"{prefix}.calls", "int64", 2, chunk)
+        self.index = ChunkedWriter(f"{prefix}.index", "int64", 4, chunk)
+        self._op_codes = {op: i for i, op in enumerate(OPS)}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.index.size
+
+    def __call__(self, op, value):
+        self.samples.append(self.model(value))
+        self.ops.append(self._op_codes[op])
+
+    def _logged(self, code, f):
+        calls, samples = self.calls, self.samples
+
+        def formula(*args, **kwargs):
+            calls.append((code, samples.size))
+            return f(*args, **kwargs)
+
+        return formula
+
+    @contextmanager
+    def _instrumented(self):
+        originals = [(cls, name, cls.__dict__[name]) for cls, name in FORMULAS]
+        for code, (cls, name, f) in enumerate(originals):
+            setattr(cls, name, self._logged(code, f))
+        previous = _field.set_monitor(self)
+        try:
+            yield
+        finally:
+            _field.set_monitor(previous)
+            for cls, name, f in originals:
+                setattr(cls, name, f)
+
+    def record(self, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) as one trace, returning its result"""
+        s0, c0 = self.samples.size, self.calls.size
+        with self._instrumented():
+            r = fn(*args, **kwargs)
+        self.index.append((s0, self.samples.size, c0, self.calls.size))
+        return r
+
+    def close(self):
+        for w in (self.samples, self.ops, self.calls, self.index):
+            w.close()
+        meta = {
+            "model": repr(self.model),
+            "width": self.model.width,
+            "dtype": self.samples.dtype.str,
+            "ops": OPS,
+            "formulas": [f"{cls.__name__}.{name}" for cls, name in FORMULAS],
+            "traces": self.index.size,
+            "samples": self.samples.size,
+            "calls": self.calls.size,
+        }
+        with open(f"{self.prefix}.json", "w") as f:
+            json.dump(meta, f, indent=1)
+
+
+def simulate(prefix, fn, inputs, model=None, dtype="uint16", chunk=1 << 16):
+    """Record fn(*args) for each tuple args of the iterable `inputs`,
+    returning the number of traces"""
+    with TraceRecorder(prefix, model, dtype, chunk) as rec:
+        for args in inputs:
+            rec.record(fn, *args)
+    return len(rec)
+
+
+def _open(path, dtype, rows, width=None):
+    shape = (rows,) if width is None else (rows, width)
+    if rows == 0:
+        # empty files cannot be mapped
+        return np.zeros(shape, dtype)
+    return np.memmap(path, dtype, "r", shape=shape)
+
+
+class Traces:
+    """Read-only view of recorded traces, as memory-mapped arrays"""
+
+    def __init__(self, prefix):
+        with open(f"{prefix}.json") as f:
+            self.meta = json.load(f)
+        m = self.meta
+        self.formulas = m["formulas"]
+        self.samples = _open(f"{prefix}.samples", m["dtype"], m["samples"], m["width"])
+        self.ops = _open(f"{prefix}.ops", "uint8", m["samples"])
+        self.calls = _open(f"{prefix}.calls", "int64", m["calls"], 2)
+        self.index = _open(f"{prefix}.index", "int64", m["traces"], 4)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, i):
+        """Samples of trace i"""
+        s0, s1, _, _ = self.index[i]
+        return self.samples[s0:s1]
+
+    def op_sequence(self, i):
+        """Field operations of trace i, as a string over OPS"""
+        s0, s1, _, _ = self.index[i]
+        return "".join(self.meta["ops"][c] for c in self.ops[s0:s1])
+
+    def formula_calls(self, i):
+        """[(formula name, sample offset within the trace)] of trace i"""
+        s0, _, c0, c1 = self.index[i]
+        return [(self.formulas[code], int(s - s0)) for code, s in self.calls[c0:c1]]
+
+
+def load(prefix):
+    return Traces(prefix)
@@ -0,0 +1,224 @@
+""" Selection of the fastest scalar multiplication per curve and scalar size
+
+Candidates are measured either by counting field operations (`OpCounter`)
+or by timing them, and the winners are persisted in a JSON cache file
+(`$ARITHM_TUNE_CACHE`, by default ~/.cache/arithm/tune.json) of the form
+
+    {curve name: {"<scalar bit length>:<ct|any>": algorithm name}}
+
+Dispatching is opt-in: once enabled with `use_cache()` (or by setting
+$ARITHM_TUNE_CACHE), `scalar_mult` (used by `Point.__mul__` and `EdwardsPoint.__rmul__`) dispatches to
+the tuned choice. Otherwise it always uses the Montgomery ladder `ml`
+(double-and-add `edwards` on Edwards curves).
+"""
+import json
+import os
+from collections import Counter
+from random import getrandbits
+from time import perf_counter
+from ..field import OpCounter
+from .mults import (
+    ml,
+    coz_ml,
+    edwards_r2l,
+    edwards_ml_const,
+    ml_const,
+    mont_ml,
+    r2l_daa,
+    r2l_regular_w,
+    r2l_daa_point_blinding,
+)
+
+# Relative cost of field operations for the "ops" measurement
+DEFAULT_WEIGHTS = {"M": 1, "S": 0.8, "A": 0.05, "I": 100, "E": 100}
+
+
+def _order(curve):
+    return curve.order if hasattr(curve, "order") else curve.r
+
+
+class Candidate:
+    """A scalar multiplication algorithm, called as fn(k, P, n) for n-bit scalars.
+    Algorithms requiring an `affine` input point get P normalised first."""
+
+    def __init__(self, fn, const, requires="j_add", affine=False):
+        self.fn = fn
+        self.const = const
+        # method that the point type must provide. The generic algorithms
+        # (+, 2*) are restricted to Jacobian points, as EdwardsPoint.__add__
+        # converts to affine coordinates (an inversion) at every step
+        self.requires = requires
+        self.affine = affine
+
+    def __call__(self, k, P, n):
+        if self.affine and P.z != P.z.field(1):
+            P = P.to_affine()
+        return self.fn(k, P, n)
+
+    def applies(self, P):
+        return hasattr(P, self.requires)
+
+
+CANDIDATES = {
+    "ml": Candidate(lambda k, P, n: ml(k, P), False),
+    "coz_ml": Candidate(lambda k, P, n: coz_ml(k, P), False, "zaddc", affine=True),
+    "mont_ml": Candidate(lambda k, P, n: mont_ml(k, P), False, "xadd"),
+    "edwards": Candidate(lambda k, P, n: edwards_r2l(k, P), False, "idbl"),
+    "edwards_ml_const": Candidate(
+        lambda k, P, n: edwards_ml_const(k, P, n), True, "idbl"
+    ),
+    "ml_const": Candidate(lambda k, P, n: ml_const(k, P, _order(P.curve)), True),
+    "r2l_daa": Candidate(lambda k, P, n: r2l_daa(k, n, P), True),
+    "r2l_daa_point_blinding": Candidate(
+        lambda k, P, n: r2l_daa_point_blinding(k, n, P), True
+    ),
+}
+for _w in range(2, 6):
+    CANDIDATES[f"r2l_regular_w{_w}"] = Candidate(
+        lambda k, P, n, w=_w: r2l_regular_w(k, n, P, w), True
+    )
+
+
+def curve_key(curve):
+    """Name under which a curve is stored in the cache"""
+    if getattr(curve, "name", None) is not None:
+        return curve.name
+    return f"{type(curve).__name__}:{curve.F.mod:x}"
+
+
+def _default_path():
+    return os.environ.get(
+        "ARITHM_TUNE_CACHE",
+        os.path.join(os.path.expanduser("~"), ".cache", "arithm", "tune.json"),
+    )
+
+
+_path = None
+_table = None
+_selected = {}
+_enabled = "ARITHM_TUNE_CACHE" in os.environ
+
+
+def use_cache(path=None, enabled=True):
+    """Use the cache file `path` (default location if None), dropping loaded choices.
+    `scalar_mult` dispatches to its choices unless `enabled` is False."""
+    global _path, _table, _enabled
+    _path = path
+    _table = None
+    _enabled = enabled
+    _selected.clear()
+
+
+def _load():
+    global _table
+    if _table is None:
+        path = _path or _default_path()
+        try:
+            with open(path) as f:
+                _table = json.load(f)
+        except (OSError, ValueError):
+            _table = {}
+    return _table
+
+
+def _save():
+    path = _path or _default_path()
+    dirname = os.path.dirname(path)
+    if dirname:
+        os.makedirs(dirname, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(_load(), f, indent=2, sort_keys=True)
+
+
+def estimate_cycles(P, k, table, nbits=None, names=None):
+    """Cycle estimates of the candidates applicable to P (whose coordinates
+    belong to a `LimbField`), for the scalar k. Returns {name: (cycles, counts)}"""
+    F = P.x.field
+    nbits = k.bit_length() if nbits is None else nbits
+    res = {}
+    for name, c in CANDIDATES.items():
+        if (names is not None and name not in names) or not c.applies(P):
+            continue
+        F.reset()
+        c(k, P, nbits)
+        res[name] = (F.cycles(table), Counter(F.counts))
+    F.reset()
+    return res
+
+
+def measure(name, P, nbits, method="ops", trials=3, weights=DEFAULT_WEIGHTS):
+    """Average cost of the candidate `name` on random `nbits`-bit scalars,
+    as weighted field operations ("ops") or seconds ("time")"""
+    fn = CANDIDATES[name]
+    scalars = [getrandbits(nbits) | (1 << (nbits - 1)) for _ in range(trials)]
+    if method == "ops":
+        with OpCounter() as c:
+            for k in scalars:
+                fn(k, P, nbits)
+        return c.cost(weights) / trials
+    if method == "time":
+        best = None
+        for k in scalars:
+            t = perf_counter()
+            fn(k, P, nbits)
+            t = perf_counter() - t
+            best = t if best is None else min(best, t)
+        return best
+    raise ValueError(f"Unknown measurement method {method}")
+
+
+def benchmark(curve, nbits, const=False, method="ops", trials=3):
+    """Costs of all candidates applicable to `curve` (on its generator)"""
+    P = curve.G
+    return {
+        name: measure(name, P, nbits, method, trials)
+        for name, c in CANDIDATES.items()
+        if c.applies(P) and (c.const or not const)
+    }
+
+
+def tune(curve, nbits, const=False, method="ops", trials=3):
+    """Measure the candidates for (curve, nbits, const) and persist the fastest"""
+    costs = benchmark(curve, nbits, const, method, trials)
+    if not costs:
+        raise ValueError(f"No candidate algorithm for {curve_key(curve)}")
+    best = min(costs, key=costs.get)
+    _load().setdefault(curve_key(curve), {})[f"{nbits}:{'ct' if const else 'any'}"] = best
+    _selected.clear()
+    _save()
+    return best
+
+
+def select(curve, nbits, const=False):
+    """Tuned (name, tuned bit length) for scalars of `nbits` bits, or None.
+    The closest tuned bit length at least `nbits` is used."""
+    key = (curve_key(curve), nbits, const)
+    if key not in _selected:
+        choice = None
+        for entry, name in _load().get(key[0], {}).items():
+            bits, mode = entry.split(":")
+            bits = int(bits)
+            if bits < nbits or (const and mode != "ct") or name not in CANDIDATES:
+                continue
+            # prefer the smallest bit length, then unconstrained choices
+            rank = (bits, mode != "any")
+            if choice is None or rank < choice[0]:
+                choice = (rank, name)
+        _selected[key] = None if choice is None else (choice[1], choice[0][0])
+    return _selected[key]
+
+
+def scalar_mult(k, P, const=False):
+    """k.P with the tuned algorithm for P's curve, `ml` (`edwards` for Edwards
+    points) if none was tuned or dispatching was not enabled. k is reduced modulo the curve order, so
+    that every algorithm returns the zero of the curve for k = 0 mod order"""
+    k %= _order(P.curve)
+    if k == 0:
+        return P.curve.zero
+    choice = select(P.curve, k.bit_length(), const) if _enabled else None
+    if choice is None:
+        # untuned default of the point model
+        name, nbits = ("edwards" if hasattr(P, "idbl") else "ml"), k.bit_length()
+    else:
+        name, nbits = choice
+    return CANDIDATES[name](k, P, nbits)
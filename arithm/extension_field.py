@@ -0,0 +1,167 @@
+""" Quadratic extension fields Fp^2 = Fp[i] / (i^2 - beta) """
+from .field import Field, FieldElement
+
+
+class QuadraticField:
+    """Quadratic extension of a prime `Field` by the square root of a non-square `beta`"""
+
+    def __init__(self, base: Field, beta=None):
+        self.base = base
+        if beta is None:
+            # i^2 = -1 allows cheaper multiplications and squarings
+            beta = -1 if base.mod % 4 == 3 else base.nonresidue().val
+        self.beta = base(beta)
+        if self.beta.legendre() != -1:
+            raise ValueError(f"{beta} is a square modulo {base.mod}")
+
+    def __repr__(self):
+        return f"Quadratic extension of {self.base} by sqrt({self.beta})"
+
+    def __call__(self, a, b=0):
+        return QuadraticFieldElement(self.base(_val(a)), self.base(_val(b)), self)
+
+    def rand(self):
+        """Get a random element"""
+        return QuadraticFieldElement(self.base.rand(), self.base.rand(), self)
+
+
+def _val(x):
+    return x if isinstance(x, int) else x.val
+
+
+class QuadraticFieldElement:
+    """An element a + b.i belonging to a `QuadraticField`"""
+
+    def __init__(self, a: FieldElement, b: FieldElement, field: QuadraticField):
+        self.a = a
+        self.b = b
+        self.field = field
+
+    def __repr__(self):
+        return f"({self.a} + {self.b}.i)"
+
+    def _lift(self, other):
+        if isinstance(other, QuadraticFieldElement):
+            return other
+        if isinstance(other, int):
+            other = self.field.base(other)
+        if isinstance(other, FieldElement):
+            return QuadraticFieldElement(other, self.field.base(0), self.field)
+        return None
+
+    def __add__(self, other):
+        o = self._lift(other)
+        if o is None:
+            return NotImplemented
+        return QuadraticFieldElement(self.a + o.a, self.b + o.b, self.field)
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        o = self._lift(other)
+        if o is None:
+            return NotImplemented
+        return QuadraticFieldElement(self.a - o.a, self.b - o.b, self.field)
+
+    def __rsub__(self, other):
+        return -self + other
+
+    def __neg__(self):
+        return QuadraticFieldElement(-self.a, -self.b, self.field)
+
+    def __eq__(self, other):
+        o = self._lift(other)
+        if o is None:
+            return NotImplemented
+        return self.a == o.a and self.b == o.b
+
+    def __hash__(self):
+        # elements of the base field compare equal to their FieldElement
+        if self.b.val == 0:
+            return hash(self.a)
+        return hash((self.a.val, self.b.val))
+
+    def _mul_beta(self, x):
+        if self.field.beta.val == self.field.base.mod - 1:
+            return -x
+        return x * self.field.beta
+
+    def __mul__(self, other):
+        if other is self:
+            return self.sqr()
+        if isinstance(other, (int, FieldElement)):
+            # multiplication by a base field element (2M)
+            return QuadraticFieldElement(self.a * other, self.b * other, self.field)
+        if not isinstance(other, QuadraticFieldElement):
+            return NotImplemented
+        # Karatsuba (3M)
+        v0 = self.a * other.a
+        v1 = self.b * other.b
+        c1 = (self.a + self.b) * (other.a + other.b) - v0 - v1
+        return QuadraticFieldElement(v0 + self._mul_beta(v1), c1, self.field)
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def sqr(self):
+        """Complex squaring (2M)"""
+        a, b = self.a, self.b
+        v0 = a * b
+        if self.field.beta.val == self.field.base.mod - 1:
+            c0 = (a + b) * (a - b)
+        else:
+            c0 = (a + b) * (a + self._mul_beta(b)) - v0 - self._mul_beta(v0)
+        return QuadraticFieldElement(c0, v0 + v0, self.field)
+
+    def conjugate(self):
+        return QuadraticFieldElement(self.a, -self.b, self.field)
+
+    def frobenius(self, k=1):
+        """x^(p^k): conjugation for odd k, identity for even k"""
+        return self.conjugate() if k & 1 else self
+
+    def norm(self) -> FieldElement:
+        """x.x^p = a^2 - beta.b^2, in the base field"""
+        return self.a * self.a - self._mul_beta(self.b * self.b)
+
+    def __invert__(self):
+        """Inversion through the norm: x^-1 = conj(x) / norm(x)"""
+        n = self.norm()
+        if n.val == 0:
+            raise ValueError("Trying to invert 0")
+        return self.conjugate() * ~n
+
+    def __truediv__(self, other):
+        o = self._lift(other)
+        if o is None:
+            return NotImplemented
+        return self * ~o
+
+    def __pow__(self, exp):
+        if exp < 0:
+            return (~self) ** -exp
+        if exp == 2:
+            return self.sqr()
+        r, b = self.field(1), self
+        while exp:
+            if exp & 1:
+                r = r * b
+            b = b.sqr()
+            exp >>= 1
+        return r
+
+
+def cipolla_sqrt(x: FieldElement) -> FieldElement:
+    """Square root in a prime field with Cipolla's algorithm, through Fp[sqrt(t^2 - x)]"""
+    if x.legendre() == -1:
+        raise ValueError(f"{x} is not a square")
+    if x.val == 0:
+        return x
+    F = x.field
+    t = 0
+    while (F(t) * F(t) - x).legendre() != -1:
+        t += 1
+    E = QuadraticField(F, (F(t) * F(t) - x).val)
+    r = E(t, 1) ** ((F.mod + 1) // 2)
+    return r.a
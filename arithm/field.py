@@ -1,7 +1,48 @@
 """ Field arithmetic modulo a prime number"""
+from collections import Counter
 from secrets import randbits
 from sympy.ntheory.primetest import isprime
 
+# Callable notified of each field operation as monitor(op, result), see `OpCounter`
+_monitor = None
+
+
+def set_monitor(monitor):
+    """Install a field operation monitor, returning the previous one"""
+    global _monitor
+    previous, _monitor = _monitor, monitor
+    return previous
+
+
+class OpCounter:
+    """Count field operations while active, e.g.
+
+    with OpCounter() as c:
+        ml(k, P)
+    c.counts  # {"M": ..., "S": ..., "A": ..., "I": ..., "E": ...}
+
+    M: multiplication, S: squaring, A: addition/subtraction/negation,
+    I: inversion, E: exponentiation (other than squaring and cubing)
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        self._previous = None
+
+    def __call__(self, op, value):
+        self.counts[op] += 1
+
+    def __enter__(self):
+        self._previous = set_monitor(self)
+        return self
+
+    def __exit__(self, *exc):
+        set_monitor(self._previous)
+
+    def cost(self, weights):
+        """Weighted sum of the operation counts"""
+        return sum(weights.get(op, 0) * n for op, n in self.counts.items())
+
 
 def exgcd(a, b):
     ## Handbook of Elliptic and Hyperelliptic Curve Cryptography 10.6.1
@@ -24,6 +65,70 @@ def invmod(x, m):
     return u % m
 
 
+def batch_invert(elems):
+    """Invert all of `elems` with a single inversion (Montgomery's trick)"""
+    if len(elems) == 0:
+        return []
+    acc = [elems[0]]
+    for x in elems[1:]:
+        acc.append(acc[-1] * x)
+    inv = ~acc[-1]
+    res = [None] * len(elems)
+    for i in range(len(elems) - 1, 0, -1):
+        res[i] = inv * acc[i - 1]
+        inv = inv * elems[i]
+    res[0] = inv
+    return res
+
+
+_sqrt_ratio_consts = {}
+
+
+def sqrt_ratio(u, v, z):
+    """Constant-time square root of a ratio (rfc9380 F.2.1.1), `z` being a non-square.
+    Returns (True, sqrt(u/v)) if u/v is a square, (False, sqrt(z.u/v)) otherwise"""
+    F = u.field
+    key = (F.mod, z.val)
+    if key not in _sqrt_ratio_consts:
+        c1 = ((F.mod - 1) & (1 - F.mod)).bit_length() - 1
+        c2 = (F.mod - 1) >> c1
+        _sqrt_ratio_consts[key] = (
+            c1,
+            (c2 - 1) // 2,
+            (1 << c1) - 1,
+            1 << (c1 - 1),
+            (z**c2).val,
+            (z ** ((c2 + 1) // 2)).val,
+        )
+    c1, c3, c4, c5, c6, c7 = _sqrt_ratio_consts[key]
+    one = F(1)
+    tv1 = F(c6)
+    tv2 = v**c4
+    tv3 = tv2 * tv2
+    tv3 = tv3 * v
+    tv5 = u * tv3
+    tv5 = tv5**c3
+    tv5 = tv5 * tv2
+    tv2 = tv5 * v
+    tv3 = tv5 * u
+    tv4 = tv3 * tv2
+    tv5 = tv4**c5
+    is_qr = tv5 == one
+    tv2 = tv3 * F(c7)
+    tv5 = tv4 * tv1
+    tv3 = [tv2, tv3][is_qr]
+    tv4 = [tv5, tv4][is_qr]
+    for i in range(c1, 1, -1):
+        tv5 = tv4 ** (1 << (i - 2))
+        e1 = tv5 == one
+        tv2 = tv3 * tv1
+        tv1 = tv1 * tv1
+        tv5 = tv4 * tv1
+        tv3 = [tv2, tv3][e1]
+        tv4 = [tv5, tv4][e1]
+    return is_qr, tv3
+
+
 class Field:
     """Field modulo a prime number"""
 
@@ -42,6 +147,15 @@ class Field:
         """Get a random element"""
         return FieldElement(randbits(self.mod.bit_length() + 64), self)
 
+    def nonresidue(self):
+        """Smallest non-square element (cached)"""
+        if not hasattr(self, "_nonresidue"):
+            z = 2
+            while FieldElement(z, self).legendre() != -1:
+                z += 1
+            self._nonresidue = FieldElement(z, self)
+        return self._nonresidue
+
 
 class FieldElement:
     """An element belonging to a `Field`"""
@@ -56,20 +170,38 @@ class FieldElement:
         return hex(self.val)
 
     def __add__(self, other):
+        if not isinstance(other, FieldElement):
+            return NotImplemented
         assert self.field.mod == other.field.mod
-        return FieldElement((self.val + other.val) % self.field.mod, self.field)
+        r = FieldElement((self.val + other.val) % self.field.mod, self.field)
+        if _monitor is not None:
+            _monitor("A", r)
+        return r
 
     def __sub__(self, other):
+        if not isinstance(other, FieldElement):
+            return NotImplemented
         assert self.field.mod == other.field.mod
-        return FieldElement((self.val - other.val) % self.field.mod, self.field)
+        r = FieldElement((self.val - other.val) % self.field.mod, self.field)
+        if _monitor is not None:
+            _monitor("A", r)
+        return r
 
     def __neg__(self):
-        return FieldElement(self.field.mod - self.val, self.field)
+        r = FieldElement(self.field.mod - self.val, self.field)
+        if _monitor is not None:
+            _monitor("A", r)
+        return r
 
     def __eq__(self, other):
+        if not isinstance(other, FieldElement):
+            return NotImplemented
         assert self.field.mod == other.field.mod
         return self.val == other.val
 
+    def __hash__(self):
+        return hash(self.val)
+
     def __neq__(self, other):
         assert self.field.mod == other.field.mod
         return self.val != other.val
@@ -82,16 +214,31 @@ class FieldElement:
             t = other
         else:
             return NotImplemented
-        return FieldElement((self.val * t) % self.field.mod, self.field)
+        r = FieldElement((self.val * t) % self.field.mod, self.field)
+        if _monitor is not None:
+            _monitor("S" if other is self else "M", r)
+        return r
 
     def __invert__(self):
-        return FieldElement(invmod(self.val, self.field.mod), self.field)
+        r = FieldElement(invmod(self.val, self.field.mod), self.field)
+        if _monitor is not None:
+            _monitor("I", r)
+        return r
 
     def __truediv__(self, other):
-        return self * invmod(other.val, self.field.mod)
+        return self * ~other
 
     def __pow__(self, exp):
-        return FieldElement(pow(self.val, exp, self.field.mod), self.field)
+        r = FieldElement(pow(self.val, exp, self.field.mod), self.field)
+        if _monitor is not None:
+            if exp == 2:
+                _monitor("S", r)
+            elif exp == 3:
+                _monitor("S", r)
+                _monitor("M", r)
+            else:
+                _monitor("E", r)
+        return r
 
     def legendre(self):
         """Compute the legendre symbol"""
@@ -118,8 +265,8 @@ class FieldElement:
 
     def sqrt(self):
         """Compute the square root"""
-        ## TODO: does not do Tonnelli-Shanks yet
-        if self.legendre() == 1 and self.field.mod % 4 == 3:
-            return self ** ((self.field.mod + 1) // 4)
-        else:
+        if self.legendre() == -1:
             raise ValueError(f"{self} is not a square")
+        if self.field.mod % 4 == 3:
+            return self ** ((self.field.mod + 1) // 4)
+        return sqrt_ratio(self, self.field(1), self.field.nonresidue())[1]
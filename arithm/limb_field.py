@@ -0,0 +1,355 @@
+""" Field arithmetic on fixed-width limbs, counting word-level operations
+
+Elements of a `LimbField` are stored as little-endian lists of `word`-bit limbs
+and every operation is carried out limb by limb, as on a small processor with a
+word x word -> 2 words multiplier. Word operations are counted in `LimbField.counts`:
+
+    mul:   word multiplications
+    add:   additions / subtractions with carry or borrow, and other single-word
+           ALU operations (shifts, masks, selections)
+    load:  limbs read from memory
+    store: limbs written to memory
+
+`LimbField.cycles` maps those counts to cycles with a user-supplied table, and
+`ecc.tune.estimate_cycles` does so for the scalar multiplication algorithms.
+
+The element API mirrors `FieldElement`, so curves can be built over a
+`LimbField` (see `WeierstrassCurve.with_field`).
+"""
+from collections import Counter
+from secrets import randbits
+from . import field as _field
+from .field import invmod
+
+
+class LimbField:
+    """Field modulo a prime, with arithmetic on `word`-bit limbs
+
+    mul: "schoolbook" or "karatsuba" limb products
+    reduction: "montgomery", or "special" for p = 2^k - c with a small c
+    """
+
+    def __init__(self, mod, word=32, mul="schoolbook", reduction="montgomery"):
+        if mul not in ("schoolbook", "karatsuba"):
+            raise ValueError(f"Unknown multiplication {mul}")
+        if reduction not in ("montgomery", "special"):
+            raise ValueError(f"Unknown reduction {reduction}")
+        self.mod = mod
+        self.word = word
+        self.mask = (1 << word) - 1
+        self.n = -(-mod.bit_length() // word)
+        self.mul = mul
+        self.reduction = reduction
+        self.counts = Counter()
+        self.p = self.to_limbs(mod, self.n)
+        if reduction == "montgomery":
+            self.R = 1 << (word * self.n)
+            self.pinv = -invmod(mod, 1 << word) & self.mask
+        else:
+            self.k = mod.bit_length()
+            c = (1 << self.k) - mod
+            if c.bit_length() > self.k // 2:
+                raise ValueError(f"{mod:x} is not of the form 2^k - c with a small c")
+            self.c = self.to_limbs(c, -(-c.bit_length() // word))
+
+    def __repr__(self):
+        return (
+            f"Limb field modulo {self.mod} ({self.n} x {self.word}-bit limbs, "
+            f"{self.mul}, {self.reduction})"
+        )
+
+    def __call__(self, val):
+        if not isinstance(val, int):
+            raise ValueError(f"{type(val)} is not supported")
+        val %= self.mod
+        if self.reduction == "montgomery":
+            val = val * self.R % self.mod
+        return LimbFieldElement(self.to_limbs(val, self.n), self)
+
+    def rand(self):
+        """Get a random element"""
+        return self(randbits(self.mod.bit_length() + 64))
+
+    def reset(self):
+        """Reset the operation counts"""
+        self.counts = Counter()
+
+    def cycles(self, table, counts=None):
+        """Cycle estimate of `counts` (default: the current counts), `table`
+        giving the cycles of each kind of operation, e.g.
+        {"mul": 1, "add": 1, "load": 2, "store": 1}"""
+        counts = self.counts if counts is None else counts
+        return sum(table[op] * n for op, n in counts.items() if n)
+
+    def to_limbs(self, x, n):
+        return [(x >> (self.word * i)) & self.mask for i in range(n)]
+
+    def from_limbs(self, a):
+        return sum(x << (self.word * i) for i, x in enumerate(a))
+
+    ## Multi-precision operations on limb lists
+
+    def _add_limbs(self, a, b):
+        """a + b, with one more limb than the longest operand"""
+        if len(a) < len(b):
+            a, b = b, a
+        w, mask = self.word, self.mask
+        r = []
+        c = 0
+        for i in range(len(a)):
+            s = a[i] + (b[i] if i < len(b) else 0) + c
+            r.append(s & mask)
+            c = s >> w
+        r.append(c)
+        self.counts.update(load=len(a) + len(b), add=len(a), store=len(r))
+        return r
+
+    def _sub_limbs(self, a, b):
+        """(a - b mod 2^(w.len(a)), borrow), len(a) >= len(b)"""
+        w, mask = self.word, self.mask
+        r = []
+        borrow = 0
+        for i in range(len(a)):
+            s = a[i] - (b[i] if i < len(b) else 0) - borrow
+            r.append(s & mask)
+            borrow = (s >> w) & 1
+        self.counts.update(load=len(a) + len(b), add=len(a), store=len(a))
+        return r, borrow
+
+    def _add_into(self, t, x, offset):
+        """t += x.2^(w.offset) in place, the carry propagating up to the end of t"""
+        w, mask = self.word, self.mask
+        c = 0
+        for i in range(offset, len(t)):
+            if i - offset >= len(x) and c == 0:
+                break
+            s = t[i] + (x[i - offset] if i - offset < len(x) else 0) + c
+            t[i] = s & mask
+            c = s >> w
+            self.counts.update(load=2, add=1, store=1)
+
+    def _schoolbook(self, a, b):
+        """Operand-scanning product, len(a) + len(b) limbs"""
+        w, mask = self.word, self.mask
+        t = [0] * (len(a) + len(b))
+        for i in range(len(a)):
+            c = 0
+            ai = a[i]
+            for j in range(len(b)):
+                s = t[i + j] + ai * b[j] + c
+                t[i + j] = s & mask
+                c = s >> w
+            t[i + len(b)] = c
+        nn = len(a) * len(b)
+        self.counts.update(
+            mul=nn, add=2 * nn, load=len(a) + 2 * nn, store=nn + len(a)
+        )
+        return t
+
+    def _karatsuba(self, a, b):
+        """Karatsuba product of equal-length operands, len(a) + len(b) limbs"""
+        n = len(a)
+        if n <= 2:
+            return self._schoolbook(a, b)
+        h = n // 2
+        a0, a1 = a[:h], a[h:]
+        b0, b1 = b[:h], b[h:]
+        z0 = self._karatsuba(a0, b0)
+        z2 = self._karatsuba(a1, b1)
+        # (a0 + a1) = sa + ca.2^(w.m) with m = n - h limbs and a carry bit ca
+        m = n - h
+        sa = self._add_limbs(a1, a0)
+        sb = self._add_limbs(b1, b0)
+        ca, cb = sa.pop(), sb.pop()
+        z1 = self._karatsuba(sa, sb) + [0]
+        # carry corrections, masked rather than branched upon
+        self._add_into(z1, [x * ca for x in sb], m)
+        self._add_into(z1, [x * cb for x in sa], m)
+        self._add_into(z1, [ca & cb], 2 * m)
+        self.counts.update(add=2 * m + 1)
+        z1, _ = self._sub_limbs(z1, z0)
+        z1, _ = self._sub_limbs(z1, z2)
+        t = z0 + z2
+        self._add_into(t, z1, h)
+        return t
+
+    def _product(self, a, b):
+        if self.mul == "karatsuba":
+            return self._karatsuba(a, b)
+        return self._schoolbook(a, b)
+
+    def _reduce_once(self, t):
+        """t mod p for t < 2p of n + 1 limbs, with a constant-time selection"""
+        n = self.n
+        d, borrow = self._sub_limbs(t, self.p)
+        # keep t if t - p borrowed
+        self.counts.update(add=n, load=2 * n, store=n)
+        return t[:n] if borrow else d[:n]
+
+    def _montgomery(self, t):
+        """t.R^-1 mod p for t < p.R (2n limbs)"""
+        n, w, mask, p = self.n, self.word, self.mask, self.p
+        t = t + [0]
+        for i in range(n):
+            m = (t[i] * self.pinv) & mask
+            c = 0
+            for j in range(n):
+                s = t[i + j] + m * p[j] + c
+                t[i + j] = s & mask
+                c = s >> w
+            s = t[i + n] + c
+            t[i + n] = s & mask
+            t[i + n + 1] += s >> w
+        self.counts.update(
+            mul=n * n + n,
+            add=2 * n * n + 3 * n,
+            load=2 * n * n + 3 * n,
+            store=n * n + 2 * n,
+        )
+        return self._reduce_once(t[n:])
+
+    def _fold(self, t):
+        """lo + hi.c where t = hi.2^k + lo"""
+        w, mask, k = self.word, self.mask, self.k
+        q, r = divmod(k, w)
+        hi = []
+        for i in range(q, len(t)):
+            x = t[i] >> r
+            if r and i + 1 < len(t):
+                x |= (t[i + 1] << (w - r)) & mask
+            hi.append(x)
+        lo = t[:q] + ([t[q] & ((1 << r) - 1)] if r else [])
+        self.counts.update(add=3 * len(hi) + 1, load=2 * len(hi) + 1, store=len(hi) + 1)
+        return self._add_limbs(lo, self._schoolbook(hi, self.c))
+
+    def _special(self, t):
+        """t mod p for p = 2^k - c: two folds and a conditional subtraction"""
+        t = self._fold(self._fold(t))
+        t = t + [0] * (self.n + 1 - len(t))
+        return self._reduce_once(t[: self.n + 1])
+
+    def _reduce(self, t):
+        if self.reduction == "montgomery":
+            return self._montgomery(t)
+        return self._special(t)
+
+
+class LimbFieldElement:
+    """An element belonging to a `LimbField` (in Montgomery form for Montgomery reduction)"""
+
+    def __init__(self, limbs, field):
+        self.limbs = limbs
+        self.field = field
+
+    @property
+    def val(self):
+        """Canonical integer value (not counted)"""
+        F = self.field
+        x = F.from_limbs(self.limbs)
+        if F.reduction == "montgomery":
+            x = x * invmod(F.R, F.mod) % F.mod
+        return x
+
+    def __repr__(self):
+        return hex(self.val)
+
+    def _notify(self, op, r):
+        if _field._monitor is not None:
+            _field._monitor(op, r)
+        return r
+
+    def _coerce(self, other):
+        if isinstance(other, LimbFieldElement):
+            assert self.field is other.field
+            return other
+        if isinstance(other, int):
+            # constants are assumed precomputed in the right representation
+            return self.field(other)
+        return None
+
+    def __add__(self, other):
+        o = self._coerce(other)
+        if o is None:
+            return NotImplemented
+        F = self.field
+        r = LimbFieldElement(F._reduce_once(F._add_limbs(self.limbs, o.limbs)), F)
+        return self._notify("A", r)
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        o = self._coerce(other)
+        if o is None:
+            return NotImplemented
+        F = self.field
+        d, borrow = F._sub_limbs(self.limbs, o.limbs)
+        # add p back (masked by the borrow)
+        s = F._add_limbs(d, [x if borrow else 0 for x in F.p])
+        F.counts.update(add=F.n, load=F.n)
+        return self._notify("A", LimbFieldElement(s[: F.n], F))
+
+    def __rsub__(self, other):
+        return -self + other
+
+    def __neg__(self):
+        return self.field(0) - self
+
+    def __eq__(self, other):
+        o = self._coerce(other)
+        if o is None:
+            return NotImplemented
+        F = self.field
+        F.counts.update(load=2 * F.n, add=F.n)
+        return self.limbs == o.limbs
+
+    def __hash__(self):
+        return hash(self.val)
+
+    def __mul__(self, other):
+        o = self._coerce(other)
+        if o is None:
+            return NotImplemented
+        F = self.field
+        r = LimbFieldElement(F._reduce(F._product(self.limbs, o.limbs)), F)
+        return self._notify("S" if other is self else "M", r)
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def _pow(self, exp):
+        F = self.field
+        if exp == 0:
+            return F(1)
+        r = b = self
+        for bit in bin(exp)[3:]:
+            r = LimbFieldElement(F._reduce(F._product(r.limbs, r.limbs)), F)
+            if bit == "1":
+                r = LimbFieldElement(F._reduce(F._product(r.limbs, b.limbs)), F)
+        return r
+
+    def __pow__(self, exp):
+        # reported to the monitor as FieldElement.__pow__ does
+        if exp < 0:
+            r = self._inverse()._pow(-exp)
+        else:
+            r = self._pow(exp)
+        if exp == 2:
+            return self._notify("S", r)
+        if exp == 3:
+            self._notify("S", r)
+            return self._notify("M", r)
+        return self._notify("E", r)
+
+    def _inverse(self):
+        if self.val == 0:
+            raise ValueError(f"{self} is not invertible modulo {self.field.mod}")
+        return self._pow(self.field.mod - 2)
+
+    def __invert__(self):
+        """Inversion by Fermat's little theorem"""
+        return self._notify("I", self._inverse())
+
+    def __truediv__(self, other):
+        return self * ~self._coerce(other)
+
@@ -0,0 +1,411 @@
+""" Dense polynomials over a `Field` or a `BinaryField`
+
+Coefficients are kept as lists of ints (lowest degree first) rather than
+`FieldElement` objects. Multiplication switches from schoolbook to Karatsuba
+to NTT (for primes p such that a large power of two divides p - 1) as the
+degree grows, and multipoint evaluation and interpolation use subproduct trees.
+"""
+from .field import invmod
+from .binary_field import BinaryField
+
+# Operand lengths from which the faster multiplications are used
+KARATSUBA_THRESHOLD = 32
+NTT_THRESHOLD = 128
+# Number of points from which subproduct trees are used
+TREE_THRESHOLD = 32
+
+
+class _PrimeOps:
+    """Coefficient arithmetic modulo a prime"""
+
+    def __init__(self, field):
+        self.field = field
+        self.p = field.mod
+
+    def add(self, a, b):
+        return (a + b) % self.p
+
+    def sub(self, a, b):
+        return (a - b) % self.p
+
+    def mul(self, a, b):
+        return a * b % self.p
+
+    def inv(self, a):
+        return invmod(a, self.p)
+
+    def scale(self, i, a):
+        """i.a for an integer i"""
+        return i * a % self.p
+
+    def convolve(self, f, g):
+        """Schoolbook product, reducing once per coefficient"""
+        r = [0] * (len(f) + len(g) - 1)
+        for i, a in enumerate(f):
+            if a:
+                for j, b in enumerate(g):
+                    r[i + j] += a * b
+        p = self.p
+        return [c % p for c in r]
+
+    def ntt_root(self, n):
+        """Primitive n-th root of unity (n a power of two), None if there is none"""
+        if (self.p - 1) % n:
+            return None
+        # z^((p-1)/2) = -1 for a non-square z, so z^((p-1)/n) has order n
+        return pow(self.field.nonresidue().val, (self.p - 1) // n, self.p)
+
+
+class _BinaryOps:
+    """Coefficient arithmetic in GF(2^n)"""
+
+    def __init__(self, field):
+        self.n = field.n
+        self.mod = field.mod
+
+    def add(self, a, b):
+        return a ^ b
+
+    sub = add
+
+    def reduce(self, a):
+        n, mod = self.n, self.mod
+        for i in range(a.bit_length() - 1, n - 1, -1):
+            if (a >> i) & 1:
+                a ^= mod << (i - n)
+        return a
+
+    @staticmethod
+    def clmul(a, b):
+        """Carry-less product"""
+        r = 0
+        while b:
+            if b & 1:
+                r ^= a
+            a <<= 1
+            b >>= 1
+        return r
+
+    def mul(self, a, b):
+        return self.reduce(self.clmul(a, b))
+
+    def inv(self, a):
+        if a == 0:
+            raise ValueError("Trying to invert 0")
+        r, e = 1, (1 << self.n) - 2
+        while e:
+            if e & 1:
+                r = self.mul(r, a)
+            a = self.mul(a, a)
+            e >>= 1
+        return r
+
+    def scale(self, i, a):
+        return a if i & 1 else 0
+
+    def convolve(self, f, g):
+        """Schoolbook product, reducing once per coefficient"""
+        r = [0] * (len(f) + len(g) - 1)
+        clmul = self.clmul
+        for i, a in enumerate(f):
+            if a:
+                for j, b in enumerate(g):
+                    r[i + j] ^= clmul(a, b)
+        return [self.reduce(c) for c in r]
+
+    def ntt_root(self, n):
+        return None
+
+
+def _ops(field):
+    if isinstance(field, BinaryField):
+        return _BinaryOps(field)
+    return _PrimeOps(field)
+
+
+def _strip(f):
+    while f and f[-1] == 0:
+        f.pop()
+    return f
+
+
+def _add(ops, f, g):
+    if len(f) < len(g):
+        f, g = g, f
+    r = list(f)
+    for i, b in enumerate(g):
+        r[i] = ops.add(r[i], b)
+    return r
+
+
+def _sub(ops, f, g):
+    r = list(f) + [0] * (len(g) - len(f))
+    for i, b in enumerate(g):
+        r[i] = ops.sub(r[i], b)
+    return r
+
+
+def _karatsuba(ops, f, g):
+    if len(f) < len(g):
+        f, g = g, f
+    if len(g) < KARATSUBA_THRESHOLD:
+        return ops.convolve(f, g)
+    h = len(f) // 2
+    f0, f1 = f[:h], f[h:]
+    if len(g) <= h:
+        # unbalanced operands: f0.g + x^h.f1.g
+        r = _karatsuba(ops, f0, g) + [0] * (len(f) - h)
+        for i, c in enumerate(_karatsuba(ops, f1, g)):
+            r[i + h] = ops.add(r[i + h], c)
+        return r
+    g0, g1 = g[:h], g[h:]
+    z0 = _karatsuba(ops, f0, g0)
+    z2 = _karatsuba(ops, f1, g1)
+    z1 = _karatsuba(ops, _add(ops, f0, f1), _add(ops, g0, g1))
+    z1 = _sub(ops, _sub(ops, z1, z0), z2)
+    r = [0] * (len(f) + len(g) - 1)
+    for i, c in enumerate(z0):
+        r[i] = c
+    for i, c in enumerate(z1):
+        r[i + h] = ops.add(r[i + h], c)
+    for i, c in enumerate(z2):
+        r[i + 2 * h] = ops.add(r[i + 2 * h], c)
+    return r
+
+
+def _ntt(a, w, p):
+    """In-place iterative number theoretic transform, len(a) a power of two"""
+    n = len(a)
+    j = 0
+    for i in range(1, n):
+        bit = n >> 1
+        while j & bit:
+            j ^= bit
+            bit >>= 1
+        j |= bit
+        if i < j:
+            a[i], a[j] = a[j], a[i]
+    m = 2
+    while m <= n:
+        wm = pow(w, n // m, p)
+        h = m // 2
+        for k in range(0, n, m):
+            x = 1
+            for t in range(k, k + h):
+                u = a[t]
+                v = a[t + h] * x % p
+                a[t] = (u + v) % p
+                a[t + h] = (u - v) % p
+                x = x * wm % p
+        m <<= 1
+
+
+def _ntt_mul(ops, f, g, w, n):
+    p = ops.p
+    a = f + [0] * (n - len(f))
+    b = g + [0] * (n - len(g))
+    _ntt(a, w, p)
+    _ntt(b, w, p)
+    c = [x * y % p for x, y in zip(a, b)]
+    _ntt(c, invmod(w, p), p)
+    ninv = invmod(n, p)
+    return [x * ninv % p for x in c[: len(f) + len(g) - 1]]
+
+
+def _mul(ops, f, g):
+    if not f or not g:
+        return []
+    if min(len(f), len(g)) >= NTT_THRESHOLD:
+        n = 1 << (len(f) + len(g) - 2).bit_length()
+        w = ops.ntt_root(n)
+        if w is not None:
+            return _ntt_mul(ops, f, g, w, n)
+    return _karatsuba(ops, f, g)
+
+
+def _inv_series(ops, f, n):
+    """h such that f.h = 1 mod x^n (Newton iteration), f[0] invertible"""
+    h = [ops.inv(f[0])]
+    k = 1
+    while k < n:
+        k = min(2 * k, n)
+        e = _sub(ops, [1], _mul(ops, f[:k], h)[:k])
+        h = _add(ops, h, _mul(ops, h, e)[:k])
+    return h
+
+
+def _divmod(ops, f, g):
+    if not g:
+        raise ZeroDivisionError("Polynomial division by zero")
+    if len(f) < len(g):
+        return [], list(f)
+    m = len(f) - len(g) + 1
+    if min(m, len(g)) < KARATSUBA_THRESHOLD:
+        # schoolbook long division
+        r = list(f)
+        q = [0] * m
+        ilc = ops.inv(g[-1])
+        for i in range(m - 1, -1, -1):
+            c = ops.mul(r[i + len(g) - 1], ilc)
+            q[i] = c
+            if c:
+                for j, b in enumerate(g):
+                    r[i + j] = ops.sub(r[i + j], ops.mul(c, b))
+        return q, _strip(r[: len(g) - 1])
+    # reversed quotient = reversed f / reversed g mod x^m
+    q = _mul(ops, f[::-1][:m], _inv_series(ops, g[::-1], m))[:m]
+    q = q + [0] * (m - len(q))
+    q = q[::-1]
+    r = _sub(ops, f, _mul(ops, q, g))[: len(g) - 1]
+    return _strip(q), _strip(r)
+
+
+def _horner(ops, f, x):
+    r = 0
+    for c in reversed(f):
+        r = ops.add(ops.mul(r, x), c)
+    return r
+
+
+def _subproduct_tree(ops, xs):
+    """Levels of the subproduct tree, leaves (x - xi) first"""
+    level = [[ops.sub(0, x), 1] for x in xs]
+    tree = [level]
+    while len(level) > 1:
+        level = [
+            _mul(ops, level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+            for i in range(0, len(level), 2)
+        ]
+        tree.append(level)
+    return tree
+
+
+def _evaluate_tree(ops, f, tree):
+    rems = [_divmod(ops, f, tree[-1][0])[1]]
+    for level in reversed(tree[:-1]):
+        rems = [
+            _divmod(ops, rems[i // 2], node)[1] if len(node) <= len(rems[i // 2]) else rems[i // 2]
+            for i, node in enumerate(level)
+        ]
+    return [r[0] if r else 0 for r in rems]
+
+
+def _batch_inv(ops, xs):
+    acc = [xs[0]]
+    for x in xs[1:]:
+        acc.append(ops.mul(acc[-1], x))
+    inv = ops.inv(acc[-1])
+    res = [0] * len(xs)
+    for i in range(len(xs) - 1, 0, -1):
+        res[i] = ops.mul(inv, acc[i - 1])
+        inv = ops.mul(inv, xs[i])
+    res[0] = inv
+    return res
+
+
+def _val(x):
+    return x if isinstance(x, int) else x.val
+
+
+class Polynomial:
+    """Polynomial over a `Field` or a `BinaryField`, with int coefficients (lowest degree first)"""
+
+    def __init__(self, coeffs, field):
+        self.field = field
+        self.ops = _ops(field)
+        if isinstance(field, BinaryField):
+            self.coeffs = _strip([_val(c) for c in coeffs])
+        else:
+            self.coeffs = _strip([_val(c) % field.mod for c in coeffs])
+
+    def _new(self, coeffs):
+        P = Polynomial.__new__(Polynomial)
+        P.field = self.field
+        P.ops = self.ops
+        P.coeffs = _strip(coeffs)
+        return P
+
+    def __repr__(self):
+        return f"Polynomial({self.coeffs})"
+
+    def degree(self):
+        """Degree (-1 for the zero polynomial)"""
+        return len(self.coeffs) - 1
+
+    def __eq__(self, other):
+        return self.coeffs == other.coeffs
+
+    def __add__(self, other):
+        return self._new(_add(self.ops, self.coeffs, other.coeffs))
+
+    def __sub__(self, other):
+        return self._new(_sub(self.ops, self.coeffs, other.coeffs))
+
+    def __neg__(self):
+        return self._new(_sub(self.ops, [], self.coeffs))
+
+    def __mul__(self, other):
+        if isinstance(other, Polynomial):
+            return self._new(_mul(self.ops, self.coeffs, other.coeffs))
+        c = _val(other)
+        return self._new([self.ops.mul(a, c) for a in self.coeffs])
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def __divmod__(self, other):
+        q, r = _divmod(self.ops, self.coeffs, other.coeffs)
+        return self._new(q), self._new(r)
+
+    def __floordiv__(self, other):
+        return divmod(self, other)[0]
+
+    def __mod__(self, other):
+        return divmod(self, other)[1]
+
+    def __call__(self, x):
+        """Evaluate at a single point, returning a field element"""
+        return self.field(_horner(self.ops, self.coeffs, _val(x)))
+
+    def derivative(self):
+        ops = self.ops
+        return self._new([ops.scale(i, c) for i, c in enumerate(self.coeffs)][1:])
+
+    def evaluate(self, xs):
+        """Evaluate at many points (ints or field elements), returning ints"""
+        ops = self.ops
+        xs = [_val(x) for x in xs]
+        if len(xs) < TREE_THRESHOLD:
+            return [_horner(ops, self.coeffs, x) for x in xs]
+        return _evaluate_tree(ops, self.coeffs, _subproduct_tree(ops, xs))
+
+    @classmethod
+    def interpolate(cls, field, xs, ys):
+        """Polynomial of degree < len(xs) through the points (xs[i], ys[i]), xs distinct"""
+        P = cls([], field)
+        ops = P.ops
+        xs = [_val(x) for x in xs]
+        ys = [_val(y) for y in ys]
+        if not xs:
+            return P
+        tree = _subproduct_tree(ops, xs)
+        M = tree[-1][0]
+        dM = [ops.scale(i, c) for i, c in enumerate(M)][1:]
+        if len(xs) < TREE_THRESHOLD:
+            dMx = [_horner(ops, dM, x) for x in xs]
+        else:
+            dMx = _evaluate_tree(ops, dM, tree)
+        level = [[ops.mul(y, w)] for y, w in zip(ys, _batch_inv(ops, dMx))]
+        # combine bottom-up: c = c_left.M_right + c_right.M_left
+        for nodes in tree[:-1]:
+            level = [
+                _add(
+                    ops,
+                    _mul(ops, level[i], nodes[i + 1]),
+                    _mul(ops, level[i + 1], nodes[i]),
+                )
+                if i + 1 < len(level)
+                else level[i]
+                for i in range(0, len(level), 2)
+            ]
+        return P._new(level[0])
@@ -8,4 +8,7 @@ setup(
     install_requires=[
         "sympy",
     ],
+    extras_require={
+        "trace": ["numpy"],
+    },
 )
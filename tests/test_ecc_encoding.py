@@ -0,0 +1,82 @@
+from random import getrandbits
+import pytest
+from arithm.ecc.ecc import Point
+from arithm.ecc.edwards import EdwardsPoint
+from arithm.ecc.curves import secp256k1, secp521r1, ed25519
+
+
+def test_sec1_roundtrip():
+    """SEC1 compressed and uncompressed encodings"""
+    for curve in (secp256k1, secp521r1):
+        P = getrandbits(64) * curve.G
+        for compressed in (True, False):
+            data = P.encode(compressed)
+            assert len(data) == 1 + curve.size * (1 if compressed else 2)
+            assert Point.decode(curve, data) == P
+    assert secp256k1.zero.encode() == b"\x00"
+    assert secp256k1.decode_point(b"\x00").is_at_infinity()
+
+
+def test_sec1_known_vector():
+    """secp256k1 generator encoding"""
+    G = secp256k1.G
+    assert G.encode().hex() == (
+        "0279be667ef9dcbbac55a06295ce870b07029bfcdb2dce28d959f2815b16f81798"
+    )
+
+
+def test_sec1_bulk_decoding():
+    """bulk decoding from a memoryview, with bad records reported by index"""
+    curve = secp256k1
+    points = [getrandbits(32) * curve.G for _ in range(6)]
+    buf = bytearray()
+    for i, P in enumerate(points):
+        buf += P.encode(i % 2 == 0)
+    decoded = list(curve.decode_points(memoryview(buf)))
+    assert decoded == points
+
+    # corrupt the y coordinate of the uncompressed record at index 3
+    offset = 2 * (1 + curve.size) + (1 + 2 * curve.size) + 1 + curve.size
+    buf[offset] ^= 1
+    with pytest.raises(ValueError, match="record 3") as exc:
+        # a copy, as the traceback keeps the memoryview of the buffer alive
+        list(curve.decode_points(bytes(buf)))
+    assert isinstance(exc.value.__cause__, ValueError)
+
+    # collect the failures instead, up to a record that cannot be framed
+    buf[1 : 1 + curve.size] = b"\xff" * curve.size
+    buf += b"\x05"
+    errors = []
+    decoded = list(curve.decode_points(buf, errors))
+    assert [i for i, _ in errors] == [0, 3, 6]
+    assert "record 3: Point is not on the curve" in str(errors[1][1])
+    assert decoded == [None, *points[1:3], None, *points[4:]]
+
+
+def test_projective_equality_and_hashing():
+    """Jacobian and extended points compare and hash without normalisation"""
+    P = secp256k1.G
+    k = getrandbits(64)
+    A = k * P  # affine
+    J = (k - 1) * P + P  # Jacobian, z != 1
+    assert J.z != secp256k1.F(1)
+    assert A == J and hash(A) == hash(J)
+    assert A != -J
+    assert secp256k1.is_on_curve(J)
+    assert not secp256k1.is_on_curve(Point(secp256k1, J.x + secp256k1.F(1), J.y, J.z))
+    assert secp256k1.zero == P - P
+    assert len({A, J, secp256k1.zero, P - P}) == 2
+    # assigning a coordinate drops the cached hash
+    B = Point(secp256k1, A.x, A.y)
+    hash(B)
+    B.y = -B.y
+    assert hash(B) == hash(-A)
+
+    F = ed25519.F
+    y = F(4) / F(5)
+    G = EdwardsPoint(ed25519, ed25519.recover_x(y, 0), y)
+    E = G.add(G).add(G)
+    assert E.z != F(1)
+    assert E == 3 * G and hash(E) == hash(3 * G)
+    assert ed25519.is_on_curve(E)
+    assert not ed25519.is_on_curve(EdwardsPoint(ed25519, E.x, E.y + F(1), E.z))
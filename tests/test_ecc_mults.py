@@ -1,4 +1,5 @@
 from binascii import unhexlify
+from itertools import islice
 from random import getrandbits
 from arithm.field import Field
 from arithm.ecc.edwards import EdwardsPoint
@@ -29,6 +30,25 @@ def test_secp256k1():
         assert ref == mlc
 
 
+def test_regular_recode():
+    """Joye-Tunstall digits are odd, bounded and recompose the scalar"""
+    for w in range(1, 7):
+        k = getrandbits(256) | 1
+        digits = regular_recode(k, 256, w)
+        assert len(digits) == -(-256 // w)
+        assert all(d & 1 and abs(d) < (1 << w) for d in digits)
+        assert sum(d << (w * i) for i, d in enumerate(digits)) == k
+
+
+def test_r2l_regular_w():
+    """regular windowed right-to-left for several window sizes"""
+    P = secp256k1.G
+    for w in range(1, 9):
+        for k in [getrandbits(256) for _ in range(8)] + [getrandbits(256) | 1, 1, 2, 3]:
+            ref = ml(k, P).to_affine()
+            assert r2l_regular_w(k, 256, P, w).to_affine() == ref
+
+
 def test_straus_secp256k1():
     """Straus' trick for secp256k1"""
     P = secp256k1.G
@@ -96,3 +116,31 @@ def test_edwards_basic():
     P.x = ed25519.recover_x(P.y, 0)
 
     assert s * P == sP
+
+
+def test_multiples():
+    """consecutive multiples k.P, (k + s).P, ... through batched affine additions"""
+    P = secp256k1.G
+    n = secp256k1.order
+    # crosses the point at infinity at the 6th point
+    for i, Q in enumerate(islice(secp256k1.multiples(P, n - 20, 4, 8), 30)):
+        k = (n - 20 + 4 * i) % n
+        if k == 0:
+            assert Q.is_at_infinity()
+        else:
+            assert Q.z == secp256k1.F(1) and Q == ml(k, P)
+
+    for i, Q in enumerate(islice(secp256k1.multiples(P, 3, 1, 1), 5)):
+        assert Q == ml(3 + i, P)
+
+    # counter mode, starting from 0 (also as a multiple of the order)
+    for k in (0, n):
+        Q = list(islice(secp256k1.multiples(P, k, 1, 4), 9))
+        assert Q[0].is_at_infinity()
+        assert all(Q[i] == ml(i, P) for i in range(1, 9))
+
+    G = ed25519.G
+    for i, Q in enumerate(islice(ed25519.multiples(G, 5, 2, 4), 13)):
+        assert Q == (5 + 2 * i) * G
+    for i, Q in enumerate(islice(ed25519.multiples(G, 0, 3, 4), 9)):
+        assert Q == (3 * i) * G
@@ -0,0 +1,34 @@
+import hashlib
+from random import getrandbits
+from arithm.ecc.curves import secp256k1, secp521r1
+from arithm.ecc.ecdsa import KeyTableCache, public_key, sign, verify, joint_mult
+
+
+def test_joint_mult():
+    """windowed u1.P + u2.Q matches separate multiplications"""
+    P = secp256k1.G
+    Q = getrandbits(64) * P
+    cache = KeyTableCache(w=3)
+    for _ in range(5):
+        u1, u2 = getrandbits(256), getrandbits(256)
+        assert joint_mult(u1, P, u2, Q, cache) == u1 * P + u2 * Q
+
+
+def test_ecdsa_sign_verify():
+    """sign/verify round trip, with the per-key LRU cache"""
+    cache = KeyTableCache(maxsize=2)
+    d = getrandbits(256) % secp256k1.order
+    Q = public_key(secp256k1, d)
+    sig = sign(secp256k1, d, b"message")
+    assert verify(secp256k1, Q, b"message", sig, cache=cache)
+    assert not verify(secp256k1, Q, b"massage", sig, cache=cache)
+    assert not verify(secp256k1, Q, b"message", (sig[0], sig[1] + 1), cache=cache)
+    assert not verify(secp256k1, -Q, b"message", sig, cache=cache)
+    # G and Q are computed once, then -Q evicts the least recently used Q
+    assert (cache.misses, cache.hits) == (3, 5)
+    assert len(cache) == 2
+
+    d = getrandbits(521) % secp521r1.order
+    Q = public_key(secp521r1, d)
+    sig = sign(secp521r1, d, b"message", hashlib.sha512)
+    assert verify(secp521r1, Q, b"message", sig, hashlib.sha512)
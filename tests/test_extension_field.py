@@ -0,0 +1,64 @@
+from random import getrandbits
+from arithm.field import Field, OpCounter, batch_invert
+from arithm.extension_field import QuadraticField, cipolla_sqrt
+from arithm.ecc.ecc import Point
+from arithm.ecc.mults import ml, r2l_regular_w
+from arithm.ecc.curves import secp256k1
+
+
+def test_quadratic_field():
+    """Karatsuba multiplication, complex squaring, Frobenius and inversions"""
+    for F in (Field(10007), Field(10009), secp256k1.F):
+        E = QuadraticField(F)
+        i = E(0, 1)
+        assert i * i == E(E.beta)
+        a, b = E.rand(), E.rand()
+        assert a * a == a**2 == a * E(a.a, a.b)
+        assert (a + b) * (a - b) == a * a - b * b
+        assert a / a == E(1)
+        assert a**-3 * a**3 == E(1) and a**-1 == ~a
+        assert E(5) == F(5) and hash(E(5)) == hash(F(5))
+        assert a ** F.mod == a.frobenius()
+        assert a * a.frobenius() == E(a.norm())
+        xs = [E.rand() for _ in range(5)]
+        assert [x * y for x, y in zip(xs, batch_invert(xs))] == [E(1)] * 5
+
+
+def test_quadratic_field_costs():
+    """3M per multiplication and 2M per squaring when i^2 = -1"""
+    E = QuadraticField(secp256k1.F)
+    a, b = E.rand(), E.rand()
+    with OpCounter() as c:
+        a * b
+    assert c.counts["M"] == 3
+    with OpCounter() as c:
+        a * a
+    assert c.counts["M"] == 2 and c.counts["S"] == 0
+
+
+def test_cipolla():
+    """Cipolla square roots, including p = 1 mod 4 primes"""
+    for p in (10009, 65537, (1 << 255) - 19):
+        F = Field(p)
+        a = F.rand()
+        a = a * a
+        r = cipolla_sqrt(a)
+        assert r * r == a
+
+
+def test_points_over_extension():
+    """scalar multiplication of a point on the quadratic twist, seen in E(Fp^2)"""
+    F = secp256k1.F
+    E = QuadraticField(F)
+    x = F(1)
+    while (x**3 + secp256k1.b).legendre() != -1:
+        x = x + F(1)
+    # y = y'.i with y'^2 = (x^3 + b) / beta
+    y = ((x**3 + secp256k1.b) / E.beta).sqrt()
+    P = Point(secp256k1, E(x), E(0, y))
+    assert secp256k1.is_on_curve(P)
+    k1, k2 = getrandbits(64), getrandbits(64)
+    Q = ml(k1, P)
+    assert secp256k1.is_on_curve(Q)
+    assert Q == r2l_regular_w(k1, 64, P, 3)
+    assert Q + ml(k2, P) == ml(k1 + k2, P)
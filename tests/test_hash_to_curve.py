@@ -0,0 +1,88 @@
+from random import getrandbits
+from arithm.field import Field
+from arithm.ecc import mults
+from arithm.ecc.mults import ml, r2l_daa_point_blinding
+from arithm.ecc.curves import secp256k1, secp521r1, ed25519
+from arithm.ecc.hash_to_curve import (
+    expand_message_xmd,
+    hash_to_curve,
+    encode_to_curve,
+    random_point,
+)
+import hashlib
+import pytest
+
+
+def test_sqrt():
+    """square roots for p = 1 mod 4, 3 mod 4 and 5 mod 8"""
+    for p in (10007, 10009, 65537, (1 << 255) - 19):
+        F = Field(p)
+        for _ in range(10):
+            a = F.rand()
+            a = a * a
+            r = a.sqrt()
+            assert r * r == a
+        with pytest.raises(ValueError):
+            F.nonresidue().sqrt()
+
+
+def test_expand_message_xmd():
+    """rfc9380 K.1 expand_message_xmd(SHA-256)"""
+    dst = b"QUUX-V01-CS02-with-expander-SHA256-128"
+    assert expand_message_xmd(b"", dst, 0x20, hashlib.sha256).hex() == (
+        "68a985b87eb6b46952128911f2a4412bbc302a9d759667f87f7a21d803f07235"
+    )
+
+
+# rfc9380 J test vectors, msg = ""
+VECTORS = [
+    (
+        secp256k1,
+        b"QUUX-V01-CS02-with-secp256k1_XMD:SHA-256_SSWU_RO_",
+        0xC1CAE290E291AEE617EBAEF1BE6D73861479C48B841EABA9B7B5852DDFEB1346,
+        0x64FA678E07AE116126F08B022A94AF6DE15985C996C3A91B64C406A960E51067,
+    ),
+    (
+        secp521r1,
+        b"QUUX-V01-CS02-with-P521_XMD:SHA-512_SSWU_RO_",
+        0x00FD767CEBB2452030358D0E9CF907F525F50920C8F607889A6A35680727F64F4D66B161FAFEB2654BEA0D35086BEC0A10B30B14ADEF3556ED9F7F1BC23CECC9C088,
+        0x0169BA78D8D851E930680322596E39C78F4FE31B97E57629EF6460DDD68F8763FD7BD767A4E94A80D3D21A3C2EE98347E024FC73EE1C27166DC3FE5EEEF782BE411D,
+    ),
+    (
+        ed25519,
+        b"QUUX-V01-CS02-with-edwards25519_XMD:SHA-512_ELL2_RO_",
+        0x3C3DA6925A3C3C268448DCABB47CCDE5439559D9599646A8260E47B1E4822FC6,
+        0x09A6C8561A0B22BEF63124C588CE4C62EA83A3C899763AF26D795302E115DC21,
+    ),
+]
+
+
+def test_hash_to_curve_vectors():
+    """rfc9380 hash_to_curve test vectors"""
+    for curve, dst, x, y in VECTORS:
+        P = hash_to_curve(curve, b"", dst).to_affine()
+        assert (P.x.val, P.y.val) == (x, y)
+
+
+def test_encode_to_curve():
+    """encode_to_curve lands on the curve (in the prime order subgroup for ed25519)"""
+    for curve in (secp256k1, secp521r1, ed25519):
+        P = encode_to_curve(curve, b"abc", b"test")
+        assert curve.is_on_curve(P)
+    P = encode_to_curve(ed25519, b"abc", b"test")
+    assert (ed25519.r * P) == ed25519.zero
+
+
+def test_blinding_with_mapped_point(monkeypatch):
+    """point blinding with a hashed random point instead of a multiple of P"""
+    P = secp256k1.G
+    k = getrandbits(256)
+    ref = ml(k, P)
+    Q = random_point(secp256k1)
+    assert r2l_daa_point_blinding(k, 256, P, Q) == ref
+    # the default blinding point is mapped too, without any scalar multiplication
+    def no_ml(k, P):
+        raise AssertionError("unexpected scalar multiplication")
+
+    monkeypatch.setattr(mults, "ml", no_ml)
+    assert r2l_daa_point_blinding(k, 256, P) == ref
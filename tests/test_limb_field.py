@@ -0,0 +1,71 @@
+from random import getrandbits
+from arithm.field import OpCounter
+from arithm.limb_field import LimbField
+from arithm.ecc import tune
+from arithm.ecc.mults import ml
+from arithm.ecc.curves import secp256k1, ed25519
+
+TABLE = {"mul": 1, "add": 1, "load": 2, "store": 1}
+
+
+def test_limb_arithmetic():
+    """limb arithmetic matches Field for all backends"""
+    for curve in (secp256k1, ed25519):
+        F = curve.F
+        for word in (16, 32):
+            for mul in ("schoolbook", "karatsuba"):
+                for reduction in ("montgomery", "special"):
+                    L = LimbField(F.mod, word, mul, reduction)
+                    for _ in range(10):
+                        a, b = F.rand(), F.rand()
+                        A, B = L(a.val), L(b.val)
+                        assert (A * B).val == (a * b).val
+                        assert (A * A).val == (a * a).val
+                        assert (A + B).val == (a + b).val
+                        assert (A - B).val == (a - b).val
+                    assert (A / B).val == (a / b).val
+                    assert (A**-3).val == (a**-3).val and (A**3).val == (a**3).val
+
+
+def test_limb_counts():
+    """word multiplications of one 8-limb field product"""
+    p = secp256k1.F.mod
+    for mul, reduction, nmul in (
+        ("schoolbook", "montgomery", 64 + 64 + 8),
+        ("karatsuba", "montgomery", 36 + 64 + 8),
+        # two folds of 8 then 3 high limbs by the 2-limb c = 2^32 + 977
+        ("schoolbook", "special", 64 + 8 * 2 + 3 * 2),
+    ):
+        L = LimbField(p, 32, mul, reduction)
+        a, b = L.rand(), L.rand()
+        L.reset()
+        a * b
+        assert L.counts["mul"] == nmul
+        assert L.cycles(TABLE) > 0
+
+
+def test_estimate_cycles():
+    """per-algorithm cycle estimates over a limb field"""
+    C = secp256k1.with_field(LimbField(secp256k1.F.mod))
+    assert tune.curve_key(C) == "secp256k1/limb32-schoolbook-montgomery"
+    assert tune.curve_key(C) != tune.curve_key(secp256k1.with_field(LimbField(C.p, 16)))
+    k = getrandbits(32)
+    assert ml(k, C.G).to_affine().x.val == ml(k, secp256k1.G).to_affine().x.val
+    res = tune.estimate_cycles(C.G, k, TABLE, names=["ml", "coz_ml", "r2l_daa"])
+    assert set(res) == {"ml", "coz_ml", "r2l_daa"}
+    assert res["coz_ml"][0] < res["ml"][0]
+
+
+def test_limb_monitor():
+    """operations are reported to the monitor as by FieldElement"""
+    F = secp256k1.F
+    L = LimbField(F.mod)
+    for x in (F(5), L(5)):
+        with OpCounter() as c:
+            x**2
+            x**3
+            x**5
+            x**-1
+            ~x
+            x * x
+        assert c.counts == {"S": 3, "M": 1, "E": 2, "I": 1}
@@ -0,0 +1,43 @@
+from binascii import unhexlify
+from random import getrandbits
+from arithm.ecc.edwards import EdwardsPoint
+from arithm.ecc.mults import mont_ml
+from arithm.ecc.curves import (
+    curve25519,
+    ed25519,
+    x25519,
+    x25519_batch,
+    edwards_to_montgomery,
+    montgomery_to_edwards,
+)
+
+
+def test_x25519_rfc7748():
+    """rfc7748 6.1 Diffie-Hellman test vectors"""
+    a = unhexlify("77076d0a7318a57d3c16c17251b26645df4c2f87ebc0992ab177fba51db92c2a")
+    b = unhexlify("5dab087e624a8a4b79e17f8b83800ee66f3bb1292618b6fd1c2f8b27ff88e0eb")
+    A = unhexlify("8520f0098930a754748b7ddcb43ef75a0dbf3a0d26381af4eba4a98eaa9b4e6a")
+    B = unhexlify("de9edb7d7b7dc1b4d35b61c2ece435373f8343c85b78674dadfc7e146f882b4f")
+    K = unhexlify("4a5d9d5ba4ce2de1728e3bf480350f25e07e21c947d19e3376f09b3c1e161742")
+    nine = (9).to_bytes(32, "little")
+
+    assert x25519(a, nine) == A
+    assert x25519(b, nine) == B
+    assert x25519(a, B) == K
+    assert x25519_batch([a, b], nine) == [A, B]
+
+
+def test_birational_map():
+    """ed25519 <-> curve25519 maps commute with scalar multiplication"""
+    F = ed25519.F
+    G = EdwardsPoint(ed25519, F(0), F(4) / F(5))
+    G.x = ed25519.recover_x(G.y, 0)
+    assert edwards_to_montgomery(G) == curve25519.G
+
+    k = getrandbits(64)
+    kG = k * G
+    assert edwards_to_montgomery(kG) == mont_ml(k, curve25519.G)
+    assert montgomery_to_edwards(mont_ml(k, curve25519.G), kG.x.val & 1) == kG
+    assert montgomery_to_edwards(mont_ml(k, curve25519.G), 1 - (kG.x.val & 1)) == -kG
+    T = EdwardsPoint(ed25519, F(0), F(-1))
+    assert montgomery_to_edwards(edwards_to_montgomery(T)) == T
@@ -0,0 +1,67 @@
+import pytest
+from random import randrange, sample
+from arithm.field import Field
+from arithm.binary_field import BinaryField
+from arithm.polynomial import Polynomial
+import arithm.polynomial as polynomial
+
+
+def naive_mul(field, f, g):
+    r = [field(0)] * (len(f) + len(g) - 1)
+    for i, a in enumerate(f):
+        for j, b in enumerate(g):
+            r[i + j] = r[i + j] + field(a) * field(b)
+    return [x.val for x in r]
+
+
+def rand_poly(field, n):
+    return [field.rand().val for _ in range(n)]
+
+
+# (Karatsuba, NTT) thresholds forcing schoolbook, Karatsuba and NTT products
+THRESHOLDS = [(1 << 30, 1 << 30), (2, 1 << 30), (2, 4)]
+
+
+@pytest.fixture(params=THRESHOLDS, ids=["schoolbook", "karatsuba", "ntt"])
+def thresholds(request, monkeypatch):
+    karatsuba, ntt = request.param
+    monkeypatch.setattr(polynomial, "KARATSUBA_THRESHOLD", karatsuba)
+    monkeypatch.setattr(polynomial, "NTT_THRESHOLD", ntt)
+
+
+def test_multiplication(thresholds):
+    """schoolbook, Karatsuba and NTT products agree with the naive product"""
+    for field in (Field(998244353), Field((1 << 255) - 19), BinaryField(8, 0x11B)):
+        for n, m in ((5, 7), (40, 33), (150, 140), (300, 37)):
+            f = rand_poly(field, n)
+            g = rand_poly(field, m)
+            ref = Polynomial(naive_mul(field, f, g), field)
+            assert Polynomial(f, field) * Polynomial(g, field) == ref
+
+
+def test_divmod(thresholds):
+    """long division and Newton division satisfy f = q.g + r"""
+    for field in (Field(998244353), BinaryField(8, 0x11B)):
+        for n, m in ((20, 7), (200, 60), (5, 9)):
+            f = Polynomial(rand_poly(field, n), field)
+            g = Polynomial(rand_poly(field, m) + [1], field)
+            q, r = divmod(f, g)
+            assert r.degree() < g.degree()
+            assert q * g + r == f
+
+
+def test_evaluation_interpolation():
+    """subproduct tree evaluation and interpolation, over GF(p) and GF(2^8)"""
+    F = Field(998244353)
+    f = Polynomial(rand_poly(F, 100), F)
+    xs = [randrange(F.mod) for _ in range(100)]
+    assert f.evaluate(xs) == [f(x).val for x in xs]
+    assert Polynomial.interpolate(F, xs, f.evaluate(xs)) == f
+
+    # Reed-Solomon style: 40 coefficients from 40 of 255 evaluations
+    B = BinaryField(8, 0x11B)
+    f = Polynomial(rand_poly(B, 40), B)
+    xs = sample(range(1, 256), 40)
+    ys = f.evaluate(xs)
+    assert ys == [f(x).val for x in xs]
+    assert Polynomial.interpolate(B, xs, ys) == f
@@ -0,0 +1,55 @@
+import pytest
+from random import getrandbits
+
+np = pytest.importorskip("numpy")
+
+from arithm.field import OpCounter
+from arithm.limb_field import LimbField
+from arithm.ecc.curves import secp256k1
+from arithm.ecc.mults import ml_const, r2l_daa
+from arithm.ecc.trace import (
+    TraceRecorder,
+    HammingWeight,
+    LimbHammingWeight,
+    load,
+    simulate,
+)
+
+
+def test_trace_recording(tmp_path):
+    """traces match the operation counts and streams cross chunk boundaries"""
+    P, n = secp256k1.G, secp256k1.order
+    prefix = str(tmp_path / "ladder")
+    scalars = [getrandbits(255) for _ in range(3)]
+    with TraceRecorder(prefix, HammingWeight(), chunk=1000) as rec:
+        for k in scalars:
+            R = rec.record(ml_const, k, P, n)
+            assert R.to_affine() == k * P
+    traces = load(prefix)
+    assert len(traces) == 3
+    with OpCounter() as c:
+        ml_const(scalars[0], P, n)
+    assert len(traces[0]) == sum(c.counts.values())
+    assert sorted(traces.op_sequence(0)) == sorted(c.counts.elements())
+    # the ladder is regular
+    assert traces.op_sequence(0) == traces.op_sequence(1) == traces.op_sequence(2)
+    names = [name for name, _ in traces.formula_calls(0)]
+    assert "Point.j_dbl" in names and "Point.j_add" in names
+    assert traces.samples.shape == (traces.index[-1, 1], 1)
+    assert traces.samples.max() <= 256
+
+
+def test_limb_model(tmp_path):
+    """limb leakage reads the stored limbs of a LimbField"""
+    L = LimbField(secp256k1.p, word=32)
+    curve = secp256k1.with_field(L)
+    model = LimbHammingWeight(L)
+    assert model.width == 8
+    prefix = str(tmp_path / "daa")
+    k = getrandbits(255)
+    assert simulate(prefix, r2l_daa, [(k, 256, curve.G)], model, "uint8") == 1
+    traces = load(prefix)
+    assert traces[0].shape[1] == 8
+    assert traces[0].max() <= 32
+    a = L(0x1234)
+    assert sum(model(a)) == sum(bin(l).count("1") for l in a.limbs)
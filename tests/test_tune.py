@@ -0,0 +1,118 @@
+import json
+from random import getrandbits
+from arithm.field import OpCounter
+from arithm.ecc import tune
+from arithm.ecc.mults import ml, edwards_r2l, edwards_ml_const
+from arithm.ecc.curves import secp256k1, ed25519
+
+
+def test_op_counter():
+    """field operations are counted while the counter is active"""
+    F = secp256k1.F
+    a, b = F(3), F(5)
+    with OpCounter() as c:
+        a * b
+        a * a
+        a + b
+        ~a
+    a * b
+    assert c.counts == {"M": 1, "S": 1, "A": 1, "I": 1}
+
+
+def test_tune_and_dispatch(tmp_path):
+    """tuned choices are persisted and used by Point.__mul__"""
+    path = tmp_path / "tune.json"
+    tune.use_cache(str(path))
+    try:
+        best = tune.tune(secp256k1, 32, trials=1)
+        best_ct = tune.tune(secp256k1, 32, const=True, trials=1)
+        assert tune.CANDIDATES[best_ct].const
+        assert json.loads(path.read_text()) == {
+            "secp256k1": {"32:any": best, "32:ct": best_ct}
+        }
+        assert tune.select(secp256k1, 20) == (best, 32)
+        assert tune.select(secp256k1, 20, const=True) == (best_ct, 32)
+        assert tune.select(secp256k1, 33) is None
+        costs = tune.benchmark(ed25519, 16, trials=1)
+        assert set(costs) == {"edwards", "edwards_ml_const"}
+        assert tune.tune(ed25519, 16, trials=1) == "edwards"
+
+        # a fresh load picks up the persisted choices
+        tune.use_cache(str(path))
+        P = secp256k1.G
+        k = getrandbits(32)
+        assert k * P == ml(k, P)
+        assert tune.select(secp256k1, k.bit_length()) == (best, 32)
+    finally:
+        tune.use_cache(enabled=False)
+
+
+def test_dispatch_jacobian_point(tmp_path):
+    """affine-only candidates get their input point normalised"""
+    path = tmp_path / "tune.json"
+    path.write_text(json.dumps({"secp256k1": {"32:any": "coz_ml"}}))
+    tune.use_cache(str(path))
+    try:
+        P = secp256k1.G
+        J = P + 3 * P
+        assert J.z != secp256k1.F(1)
+        k = getrandbits(32) | (1 << 31)
+        R = k * J
+        assert secp256k1.is_on_curve(R)
+        assert R == ml(k, J)
+        assert R == ml(4 * k, P)
+    finally:
+        tune.use_cache(enabled=False)
+
+
+def test_dispatch_is_opt_in(tmp_path):
+    """a cache file is ignored by Point.__mul__ until dispatching is enabled"""
+    path = tmp_path / "tune.json"
+    path.write_text(json.dumps({"secp256k1": {"32:any": "r2l_daa"}}))
+    P = secp256k1.G
+    k = getrandbits(32) | (1 << 31)
+    with OpCounter() as ref:
+        ml(k, P).to_affine()
+    try:
+        for enabled in (False, True):
+            tune.use_cache(str(path), enabled)
+            with OpCounter() as c:
+                R = k * P
+            assert R == ml(k, P)
+            assert (c.counts == ref.counts) != enabled
+    finally:
+        tune.use_cache(enabled=False)
+
+
+def test_dispatch_zero_and_negative(tmp_path):
+    """multiples of the order give zero and negative scalars are reduced, whatever the choice"""
+    path = tmp_path / "tune.json"
+    path.write_text(json.dumps({"secp256k1": {"256:any": "r2l_daa"}}))
+    P = secp256k1.G
+    n = secp256k1.order
+    k = getrandbits(32)
+    try:
+        for enabled in (False, True):
+            tune.use_cache(str(path), enabled)
+            assert (0 * P).is_at_infinity() and (n * P).is_at_infinity()
+            assert -k * P == -(k * P)
+    finally:
+        tune.use_cache(enabled=False)
+
+
+def test_tune_edwards_const(tmp_path):
+    """constant-time tuning on ed25519, used by EdwardsPoint.__rmul__"""
+    tune.use_cache(str(tmp_path / "tune.json"))
+    try:
+        assert tune.tune(ed25519, 64, const=True, trials=1) == "edwards_ml_const"
+        G = ed25519.G
+        k = getrandbits(64) | (1 << 63)
+        with OpCounter() as ref:
+            R = edwards_ml_const(k, G, 64).to_affine()
+        with OpCounter() as c:
+            kG = k * G
+        assert kG == R and c.counts == ref.counts
+        assert R == edwards_r2l(k, G)
+        assert (ed25519.r * G) == ed25519.zero
+    finally:
+        tune.use_cache(enabled=False)